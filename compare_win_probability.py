@@ -5,14 +5,14 @@ def enable_comparison_mode():
     Enable win probability comparison mode by replacing the
     enhanced_win_probability module with win_probability.
     """
-    # Import the standard modules first
+    # Import the standard modules first, so they bind the real evaluation helpers
     import switch_manager
-    switch_manager.patch_switch_manager()
     
     print("Setting up win probability comparison mode...")
     
     # Now replace the evaluation module with our comparison module
     import win_probability
+    win_probability.WIN_PROBABILITY_COMPARE = True
     sys.modules['evaluation'] = win_probability
     sys.modules['enhanced_win_probability'] = win_probability
     
@@ -136,10 +136,24 @@ king_endgame_table = [
 # UCI Engine Path (Modify this to point to your preferred engine)
 UCI_ENGINE_PATH = "C:\\Users\\avani\\Documents\\Work\\Work_projects\\Internships\\Proxgy\\Caesars_chess\\stockfish-windows-x86-64-avx2 (1)\\stockfish\stockfish-windows-x86-64-avx2.exe"
 
+# Number of single-threaded engines EngineManager.analyse_many spreads positions over
+ANALYSIS_POOL_SIZE = max(1, (os.cpu_count() or 2) // 2)
+
+# UCI options for the shared analysis engine (options an engine lacks are skipped).
+# Its threads share the cores with the pool engines, leaving one for the game itself.
+ANALYSIS_ENGINE_THREADS = max(1, (os.cpu_count() or 2) - ANALYSIS_POOL_SIZE - 1)
+ANALYSIS_ENGINE_HASH_MB = 256
+ANALYSIS_ENGINE_OPTIONS = {
+    "Threads": ANALYSIS_ENGINE_THREADS,
+    "Hash": ANALYSIS_ENGINE_HASH_MB,
+    "UCI_AnalyseMode": True,
+}
+
 # User-selected switch trigger mode: "move" or "timer"
 SWITCH_TRIGGER_MODE = "move"  # Default is move-based switching
 SWITCH_TIMER_DURATION = 15000  # 15 seconds (in milliseconds)
 RANDOM_TOKEN_MOVES = []  # Will contain three random move numbers
+RANDOM_TOKEN_RANGES = ((5, 20), (20, 45), (45, 70))  # Early, mid and late game windows
 
 # Game Settings Screen 
 # Font Settings
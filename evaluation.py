@@ -2,72 +2,60 @@ import chess
 import math
 from configuration import pawn_table, knight_table, bishop_table, rook_table, queen_table, king_table, king_endgame_table
 
-def calculate_win_probability(board):
-    """Calculates the probability of winning for white and black,
-    incorporating piece-square tables."""
+# Material value of each piece type
+PIECE_VALUES = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9,
+    chess.KING: 0  # King doesn't directly contribute to material score
+}
+
+PIECE_SQUARE_TABLES = {
+    chess.PAWN: pawn_table,
+    chess.KNIGHT: knight_table,
+    chess.BISHOP: bishop_table,
+    chess.ROOK: rook_table,
+    chess.QUEEN: queen_table,
+    chess.KING: king_table
+}
 
+def piece_score(piece_type, color, square):
+    """Returns what one piece adds to its own side's score: material plus PST adjustment."""
+    table = PIECE_SQUARE_TABLES[piece_type]
+    # Black reads the tables mirrored, except for the king
+    if color == chess.WHITE or piece_type == chess.KING:
+        return PIECE_VALUES[piece_type] + table[square]
+    return PIECE_VALUES[piece_type] + table[chess.square_mirror(square)]
+
+def material_scores(board):
+    """Returns the (white_score, black_score) totals used by calculate_win_probability."""
     white_score = 0
     black_score = 0
-    piece_values = {
-        chess.PAWN: 1,
-        chess.KNIGHT: 3,
-        chess.BISHOP: 3,
-        chess.ROOK: 5,
-        chess.QUEEN: 9,
-        chess.KING: 0  # King doesn't directly contribute to material score
-    }
-
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            value = piece_values[piece.piece_type]
-            if piece.color == chess.WHITE:
-                white_score += value
-                # PST adjustments
-                if piece.piece_type == chess.PAWN:
-                    white_score += pawn_table[square]
-                elif piece.piece_type == chess.KNIGHT:
-                    white_score += knight_table[square]
-                elif piece.piece_type == chess.BISHOP:
-                    white_score += bishop_table[square]
-                elif piece.piece_type == chess.ROOK:
-                    white_score += rook_table[square]
-                elif piece.piece_type == chess.QUEEN:
-                    white_score += queen_table[square]
-                elif piece.piece_type == chess.KING:
-                     white_score += king_table[square]
-            else:
-                black_score += value
-                # PST adjustments (mirror for black)
-                if piece.piece_type == chess.PAWN:
-                    black_score += pawn_table[chess.square_mirror(square)]
-                elif piece.piece_type == chess.KNIGHT:
-                    black_score += knight_table[chess.square_mirror(square)]
-                elif piece.piece_type == chess.BISHOP:
-                    black_score += bishop_table[chess.square_mirror(square)]
-                elif piece.piece_type == chess.ROOK:
-                    black_score += rook_table[chess.square_mirror(square)]
-                elif piece.piece_type == chess.QUEEN:
-                    black_score += queen_table[chess.square_mirror(square)]
-                elif piece.piece_type == chess.KING:
-                     black_score += king_table[square]
+    for square, piece in board.piece_map().items():
+        if piece.color == chess.WHITE:
+            white_score += piece_score(piece.piece_type, chess.WHITE, square)
+        else:
+            black_score += piece_score(piece.piece_type, chess.BLACK, square)
+    return white_score, black_score
 
+def probability_from_scores(white_score, black_score):
+    """Maps white and black scores to (white_prob, black_prob)."""
     # Normalize scores and handle the case if both are zero.
-    if white_score == 0 and black_score == 0:
-        return 0.5, 0.5
-
     total_score = white_score + black_score
-    
-    #Check if the score is equal to 0
-    if total_score ==0:
+    if total_score == 0:
         return 0.5, 0.5
-    
-    total_score = white_score + black_score
+
     normalized_white_score = white_score / total_score
-    normalized_black_score = black_score / total_score
 
     # Use a logistic function for probability, ensuring it's between 0 and 1
     white_prob = 1 / (1 + math.exp(-5 * (normalized_white_score - 0.5)))  # Adjust scaling factor for sensitivity
     black_prob = 1 - white_prob
 
-    return white_prob, black_prob
\ No newline at end of file
+    return white_prob, black_prob
+
+def calculate_win_probability(board):
+    """Calculates the probability of winning for white and black,
+    incorporating piece-square tables."""
+    return probability_from_scores(*material_scores(board))
@@ -103,6 +103,10 @@ class ChessGame:
 
         self.selected_piece = None
         self.valid_moves = []
+
+        # Result of the latest update(), read directly by the main loop
+        self.game_state = None
+        self.game_over = False
         
     def _initialize_tokens(self):
         """Initialize token positions for the game."""
@@ -252,8 +256,11 @@ class ChessGame:
         pass  # No need to do anything here, state is managed in handle_switch_sequence
 
     def update(self):
+        """Advance one frame and store the result in game_state/game_over."""
         # Process events and get game state
         game_state, game_over = self.get_game_state()
+        self.game_state = game_state
+        self.game_over = game_over
         
         # Handle switch sequence state transitions BEFORE rendering
         self.handle_switch_sequence()
@@ -383,7 +390,6 @@ class ChessGame:
                 self.view.draw_check_message(self.screen, game_state)
 
         pygame.display.flip()
-        return game_state, game_over
 
     def make_move(self, move):
         """Execute a chess move on the board."""
@@ -12,37 +12,93 @@ import random
 import os
 import sys
 import time
-import asyncio
+import argparse
+import multiprocessing
 
 # Import settings screen
 from settings_screen import SettingsScreen
 
-# Enable enhanced win probability
-try:
-    from win_probability import update_win_probability
-    update_win_probability()
-except ImportError:
-    print("Enhanced win probability not available.")
-
 # Get the logger from the configuration
 logger = configuration.logger
 SEPARATOR = "---------------------------------------"
 
-# Initialize Pygame
-pygame.init()
-logger.info("Pygame initialized.")
-    
+# Set once the process has run its one-time setup
+_initialized = False
+
+# Settings used for unattended games driven by --batch
+BATCH_GAME_SETTINGS = {
+    'switch_trigger_mode': "move",
+    'switch_mode': 2,
+    'game_mode': "AI vs AI",
+    'use_tokens': False,
+    'random_token_moves': None
+}
+
+def _initialize():
+    """Enables enhanced win probability and starts pygame, once per process.
+
+    Runs on first use rather than at import so spawned batch workers set
+    themselves up instead of inheriting the parent's state.
+    """
+    global _initialized
+    if _initialized:
+        return
+
+    # Enable enhanced win probability
+    try:
+        from win_probability import update_win_probability
+        update_win_probability()
+    except ImportError:
+        print("Enhanced win probability not available.")
+
+    # Initialize Pygame
+    pygame.init()
+    logger.info("Pygame initialized.")
+    _initialized = True
+
 def main():
+    _initialize()
+
     # Show settings screen
     settings_screen = SettingsScreen()
     game_settings = settings_screen.run()
+
+    game, white_probabilities, black_probabilities, move_numbers = play_game(game_settings)
     
+    # Print switch statistics after game ends
+    print(f"White pieces switched {game.switch_manager.white_switch_count} times")
+    print(f"Black pieces switched {game.switch_manager.black_switch_count} times")
+    print(f"Switch Move Numbers: {game.switch_manager.switch_move_numbers}")
+    
+    # Generate win probability plot
+    plot_win_probabilities(move_numbers, white_probabilities, black_probabilities, game.switch_manager.switch_move_numbers)
+    logger.info("Win probability plot generated.")
+    print("Win probability plot generated.")
+
+    # At the end of the function, add:
+    try:
+        from win_probability import shutdown
+        shutdown()
+    except ImportError:
+        pass
+
+def play_game(game_settings, move_delay=1):
+    """Runs one game with the given settings until it ends.
+
+    move_delay is the pause in seconds before each AI move, so a watcher can
+    follow the game; pass 0 to play at full speed.
+
+    Returns:
+        tuple: (game, white_probabilities, black_probabilities, move_numbers)
+    """
     # Extract settings
     switch_trigger_mode = game_settings['switch_trigger_mode']
     switch_mode = game_settings['switch_mode']
     game_mode = game_settings['game_mode']
     use_tokens = game_settings['use_tokens']
     random_token_moves = game_settings.get('random_token_moves')
+
+    _initialize()
     
     # Log selected settings
     logger.info(f"User selected switch trigger mode: {switch_trigger_mode}")
@@ -94,16 +150,18 @@ def main():
             if game.board.turn == chess.WHITE and not isinstance(player_white, HumanPlayer):
                 move = player_white.choose_move(game.board)
                 if move:
-                    time.sleep(1)
+                    if move_delay:
+                        time.sleep(move_delay)
                     game.make_move(move)
-                    logger.info(f"AI Move applied: {move.uci()}")
+                    logger.info("AI Move applied: %s", move)
                     print(f"Move applied: {move.uci()}")
             elif game.board.turn == chess.BLACK and not isinstance(player_black, HumanPlayer):
                 move = player_black.choose_move(game.board)
                 if move:
-                    time.sleep(1)
+                    if move_delay:
+                        time.sleep(move_delay)
                     game.make_move(move)
-                    logger.info(f"AI Move applied: {move.uci()}")
+                    logger.info("AI Move applied: %s", move)
                     print(f"Move applied: {move.uci()}")
 
             # For human players, moves are handled by click events
@@ -111,7 +169,7 @@ def main():
 
             # Calculate and log win probabilities after a move is made
             white_prob, black_prob = calculate_win_probability(game.board)
-            logger.info(f"White win prob: {white_prob*100:.2f}%, Black win prob: {black_prob*100:.2f}%")
+            logger.info("White win prob: %.2f%%, Black win prob: %.2f%%", white_prob * 100, black_prob * 100)
             print(f"White win prob: {white_prob*100:.2f}%, Black win prob: {black_prob*100:.2f}%")
 
             # Store probability data for later analysis
@@ -120,39 +178,89 @@ def main():
             move_numbers.append(game.move_count)
 
         # Update game state
-        game_state, game_over = game.update()
+        game.update()
+        game_state = game.game_state
+        game_over = game.game_over
 
         # Control game speed
         clock.tick(60)
 
         # Display final game state message if the game has ended
         if game_state:
-            logger.info(f"Game over: {game_state}")
+            logger.info("Game over: %s", game_state)
             print(f"Game over: {game_state}")
         if game_over:
-            game.screen.fill((245, 235, 220))
-            game.view.draw_game_state(game.screen, game_state)
-    
-    
-    # Print switch statistics after game ends
-    print(f"White pieces switched {game.switch_manager.white_switch_count} times")
-    print(f"Black pieces switched {game.switch_manager.black_switch_count} times")
-    print(f"Switch Move Numbers: {game.switch_manager.switch_move_numbers}")
-    
-    # Generate win probability plot
-    plot_win_probabilities(move_numbers, white_probabilities, black_probabilities, game.switch_manager.switch_move_numbers)
-    logger.info("Win probability plot generated.")
-    print("Win probability plot generated.")
+            # Paint the final screen once and leave the loop straight away; unpaced
+            # games skip it, as draw_game_state holds the message on screen for 2s
+            if move_delay:
+                game.screen.fill((245, 235, 220))
+                game.view.draw_game_state(game.screen, game_state)
+            break
 
-    # At the end of the function, add:
-    try:
-        from win_probability import shutdown
-        shutdown()
-    except ImportError:
-        pass
+    return game, white_probabilities, black_probabilities, move_numbers
 
-# Run the game if the script is executed directly
-# if __name__ == "__main__":
-#     main()
+def run_one_game(game_settings, headless=True):
+    """Plays a single game without the settings screen or the final plot.
+
+    Suitable as a multiprocessing.Pool worker: the optional 'seed' entry in
+    game_settings seeds the random module so batch runs are reproducible.
+
+    Returns:
+        tuple: (white_probabilities, black_probabilities, switch_move_numbers)
+    """
+    if headless:
+        # Use the dummy driver so no window opens
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    _initialize()
+    if headless:
+        # Restart the display module in case it was already started on another driver
+        pygame.display.quit()
+        pygame.display.init()
+
+    seed = game_settings.get('seed')
+    if seed is not None:
+        random.seed(seed)
+
+    # Nobody watches a headless game, so don't pause between moves
+    game, white_probabilities, black_probabilities, _ = play_game(game_settings, move_delay=0 if headless else 1)
 
-asyncio.run(main())
\ No newline at end of file
+    # Release the per-game engine processes; the analysis engine stays warm
+    for player in (game.player_white, game.player_black):
+        if hasattr(player, 'close'):
+            player.close()
+
+    return white_probabilities, black_probabilities, list(game.switch_manager.switch_move_numbers)
+
+def run_batch(num_games, workers=None, game_settings=None):
+    """Plays num_games headless games across a pool of worker processes.
+
+    Returns:
+        list: One (white_probabilities, black_probabilities, switch_move_numbers)
+        tuple per game, in completion order.
+    """
+    settings = dict(BATCH_GAME_SETTINGS, **(game_settings or {}))
+    jobs = [dict(settings, seed=seed) for seed in range(num_games)]
+
+    logger.info("Starting batch of %d games on %d workers", num_games, workers or multiprocessing.cpu_count())
+    # Spawn fresh workers rather than forking a process that may hold SDL and engine state
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        results = list(pool.imap_unordered(run_one_game, jobs))
+    logger.info("Batch finished.")
+    return results
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Caesar's Chess")
+    parser.add_argument('--batch', type=int, default=0, metavar='N',
+                        help="play N headless AI vs AI games instead of opening the settings screen")
+    parser.add_argument('--workers', type=int, default=None, metavar='K',
+                        help="number of worker processes for --batch (default: CPU count)")
+    return parser.parse_args()
+
+# Run the game if the script is executed directly
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.batch:
+        for i, (white_probs, black_probs, switch_moves) in enumerate(run_batch(args.batch, args.workers), 1):
+            print(f"Game {i}: {len(white_probs)} evaluations, switches at moves {switch_moves}")
+    else:
+        main()
\ No newline at end of file
@@ -39,8 +39,11 @@ def plot_win_probabilities(move_numbers, white_probabilities, black_probabilitie
     plt.ylim(0, 1)
     plt.xlim(left=1)
     handles, labels = plt.gca().get_legend_handles_labels()
-    by_label = dict(zip(labels, handles))
-    plt.legend(by_label.values(), by_label.keys(), loc='upper left')
+    # Keep the first handle for each label, preserving plot order
+    seen = set()
+    filtered = [(h, l) for h, l in zip(handles, labels) if not (l in seen or seen.add(l))]
+    if filtered:
+        plt.legend(*zip(*filtered), loc='upper left')
     plt.grid(True)
     plt.show()
     plt.close()
\ No newline at end of file
@@ -2,6 +2,9 @@ import pygame
 import sys
 import os
 import random
+import hashlib
+import tempfile
+from functools import partial
 import configuration
 
 class SettingsScreen:
@@ -9,12 +12,22 @@ class SettingsScreen:
     Graphical settings screen for Caesar's Chess game.
     Redesigned to match the provided UI design.
     """
+
+    # Events after which the window surface must be repainted in full
+    _EXPOSE_EVENTS = tuple(
+        getattr(pygame, name) for name in ('VIDEOEXPOSE', 'WINDOWEXPOSED', 'WINDOWRESTORED')
+        if hasattr(pygame, name)
+    )
     
     def __init__(self):
         # Initialize pygame
         pygame.init()
         self.start_game = False
 
+        # Track button states
+        self.buttons = {}
+        self.active_button = None
+
         # Centralized configuration variables
         self.config = {
             # Screen dimensions
@@ -99,33 +112,58 @@ class SettingsScreen:
 
         # Use colors from config
         self.colors = self.config['colors']
+        # Colours used every frame, flattened from config for the draw code
+        self.primary_text_color = self.colors['primary_text']
+        self.button_border_color = self.colors['button_border']
+        self.button_bg_color = self.colors['button_bg']
+        self.button_selected_color = self.colors['button_selected']
+        self.button_hover_color = self.colors['button_hover']
+
+        # Element dimensions and positions, flattened from config for the draw code
+        self.section_container_width = self.config['elements']['section_container_width']
+        self.button_gap = self.config['elements']['button_gap']
+        self.begin_button_width = self.config['elements']['begin_button_width']
+        self.begin_button_height = self.config['elements']['begin_button_height']
+        self.section_start_y = self.config['positions']['section_start_y']
+        self.section_gap = self.config['positions']['section_gap']
+
+        # Loaded fonts keyed by (name, size), and the folders searched for asset files
+        self._font_cache = {}
+        self._font_search_dirs = []
+
+        # Rendered text surfaces keyed by (text, font_key, color)
+        self._text_cache = {}
+
+        # Button shadow surfaces keyed by (width, height, border radius)
+        self._shadow_pool = {}
+
+        # Wrapped description lines keyed by (setting key, option value, max width)
+        self._wrap_cache = {}
+
+        # Description font text widths used for wrapping and centring
+        self._desc_width_cache = {}
+
+        # Wrapped descriptions composed into one surface, keyed like _wrap_cache
+        self._desc_block_cache = {}
         
         # Find and load assets
         self.assets_folder = self._find_assets_folder()
+        self._asset_index = self._build_asset_index()
+        self._preload_assets()
         
         # Load background
         self.background = self._load_background()
 
-    
-        # Load fonts using configuration
-        self.cinzel_decorative_bold = self._load_font_from_config('title')
-        self.cinzel_regular = self._load_font_from_config('subtitle')
-        self.cinzel_regular_larger = self._load_font_from_config('section_title')
-        self.cormorant_unicase = self._load_font_from_config('button')
-        self.cormorant_unicase_medium = self._load_font_from_config('button')
-
-        # Create font fallbacks if needed
-        if not self.cinzel_decorative_bold:
-            self.cinzel_decorative_bold = pygame.font.Font(None, self.config['fonts']['title']['size'])
-        if not self.cinzel_regular:
-            self.cinzel_regular = pygame.font.Font(None, self.config['fonts']['subtitle']['size'])
-        if not self.cinzel_regular_larger:
-            self.cinzel_regular_larger = pygame.font.Font(None, self.config['fonts']['section_title']['size'])
-        if not self.cormorant_unicase:
-            self.cormorant_unicase = pygame.font.Font(None, self.config['fonts']['button']['size'])
-        if not self.cormorant_unicase_medium:
-            self.cormorant_unicase_medium = pygame.font.Font(None, self.config['fonts']['button']['size'])
-            
+        # Load every configured font once, falling back to the default font at the configured size
+        self._fonts = {
+            font_key: self._load_font_from_config(font_key) or pygame.font.Font(None, font_config['size'])
+            for font_key, font_config in self.config['fonts'].items()
+        }
+        self.cinzel_decorative_bold = self._fonts['title']
+        self.cinzel_regular = self._fonts['subtitle']
+        self.cinzel_regular_larger = self._fonts['section_title']
+        self.cormorant_unicase = self._fonts['button']
+
         # Settings and options
         self.settings = {
             'switch_trigger_mode': "move",
@@ -134,51 +172,48 @@ class SettingsScreen:
             'use_tokens': True
         }
         
-        try:
-            # Options for each setting
-            self.options = {
-                'switch_trigger_mode': [
-                    {'value': "move", 'label': "MOVE BASED", 'description': "Switch occurs every 5 moves"},
-                    {'value': "timer", 'label': "TIME BASED", 'description': "Switch occurs every 15 seconds"},
-                    {'value': "player", 'label': "PLAYER INITATED", 'description': "Player activates switch with button"},
-                    {'value': "random_token", 'label': "RANDOM TOKEN", 'description': "Switch occurs at 3 random moves"}
-                ],
-                'switch_mode': [
-                    {'value': 1, 'label': "SINGLE PIECE", 'description': "One piece changes color at a time"},
-                    {'value': 2, 'label': "TWO PIECES", 'description': "One piece from each side changes color"}
-                ],
-                'game_mode': [
-                    {'value': "User vs AI", 'label': "USER VS AI", 'description': "Play against the computer"},
-                    {'value': "AI vs AI", 'label': "AI VS AI", 'description': "Watch computer players battle"},
-                    {'value': "User vs User", 'label': "USER VS USER", 'description': "Play against another person"}
-                ],
-                'use_tokens': [
-                    {'value': True, 'label': "ENABLED", 'description': "Use tokens to prevent piece switching"},
-                    {'value': False, 'label': "DISABLED", 'description': "Play without tokens"}
-                ]
-            }
-            print("Successfully initialized options")
-        except Exception as e:
-            print(f"Error initializing options: {e}")
-            # Provide a basic fallback for options
-            self.options = {
-                'switch_trigger_mode': [{'value': "move", 'label': "MOVE BASED", 'description': "Default mode"}],
-                'switch_mode': [{'value': 2, 'label': "TWO PIECES", 'description': "Default mode"}],
-                'game_mode': [{'value': "User vs AI", 'label': "USER VS AI", 'description': "Default mode"}],
-                'use_tokens': [{'value': True, 'label': "ENABLED", 'description': "Default mode"}]
-}
-        
-        # Generate random token moves
-        self.random_token_moves = [
-            random.randint(5, 20),    # Early game
-            random.randint(20, 45),   # Mid game
-            random.randint(45, 70)    # Late game
+        # Options for each setting
+        self.options = {
+            'switch_trigger_mode': [
+                {'value': "move", 'label': "MOVE BASED", 'description': "Switch occurs every 5 moves"},
+                {'value': "timer", 'label': "TIME BASED", 'description': "Switch occurs every 15 seconds"},
+                {'value': "player", 'label': "PLAYER INITATED", 'description': "Player activates switch with button"},
+                {'value': "random_token", 'label': "RANDOM TOKEN", 'description': "Switch occurs at 3 random moves"}
+            ],
+            'switch_mode': [
+                {'value': 1, 'label': "SINGLE PIECE", 'description': "One piece changes color at a time"},
+                {'value': 2, 'label': "TWO PIECES", 'description': "One piece from each side changes color"}
+            ],
+            'game_mode': [
+                {'value': "User vs AI", 'label': "USER VS AI", 'description': "Play against the computer"},
+                {'value': "AI vs AI", 'label': "AI VS AI", 'description': "Watch computer players battle"},
+                {'value': "User vs User", 'label': "USER VS USER", 'description': "Play against another person"}
+            ],
+            'use_tokens': [
+                {'value': True, 'label': "ENABLED", 'description': "Use tokens to prevent piece switching"},
+                {'value': False, 'label': "DISABLED", 'description': "Play without tokens"}
+            ]
+        }
+
+        # Settings sections in display order: (title, instruction, setting key)
+        self.sections = [
+            ("SWITCH TRIGGER MODE", "INSTRUCTION", 'switch_trigger_mode'),
+            ("SWITCH MODE", "INSTRUCTION", 'switch_mode'),
+            ("GAME MODE", "INSTRUCTION", 'game_mode'),
+            ("TOKEN MECHANIC", "INSTRUCTION", 'use_tokens')
         ]
+
+        # Options indexed by value so the selected one can be looked up directly
+        self._option_by_value = {key: {opt['value']: opt for opt in opts} for key, opts in self.options.items()}
         
-        # Track button states
-        self.buttons = {}
-        self.active_button = None
-        print("Button states initialized")
+        # Random token moves are only rolled when that trigger mode is selected
+        self.random_token_moves = None
+
+        # Redraw only when something visible changes, polling at a capped rate
+        self._dirty = True
+        self._dirty_rects = []
+        self._hovered_button = None
+        self._clock = pygame.time.Clock()
                     
         # Load separator image or create one
         try:
@@ -194,35 +229,31 @@ class SettingsScreen:
             # Fallback in case of error
             self.corner = None
 
-            # Make sure all required attributes exist
-        self._ensure_attributes()
+        # Flip the corner for each screen corner once, rather than every frame
+        self._corners = self._orient_corners(self.corner) if self.corner is not None else ()
+
+        # Section geometry only depends on the config, so compute it once
+        self._precompute_layouts()
+        self._build_begin_button()
+
+        # Rasterize every fixed string now so the first frame doesn't stall on glyph loading
+        self._prewarm_text_cache()
           
     
     def _load_font(self, font_name, font_size):
-        """Load a font with the given name and size."""
+        """Load a font with the given name and size, reusing fonts already loaded."""
+        cached_font = self._font_cache.get((font_name, font_size))
+        if cached_font is not None:
+            return cached_font
+
         if not self.assets_folder:
             return None
             
         try:
-            font_path = os.path.join(self.assets_folder, font_name)
-            if os.path.exists(font_path):
-                return pygame.font.Font(font_path, font_size)
-                
-            # Try some alternative paths
-            alt_paths = [
-                os.path.join(self.assets_folder, "Cinzel", "static", font_name),
-                os.path.join(self.assets_folder, "Cormorant", "static", font_name),
-                r"C:\Users\avani\Documents\Work\Work_projects\Internships\Proxgy\Chess_game - V38 - UI\assets2\Cinzel\static",
-                r"C:\Users\avani\Documents\Work\Work_projects\Internships\Proxgy\Chess_game - V38 - UI\assets2\Cormorant\static"
-            ]
-            
-            for base_path in alt_paths:
-                full_path = os.path.join(base_path, font_name) if not base_path.endswith(font_name) else base_path
-                if os.path.exists(full_path):
-                    return pygame.font.Font(full_path, font_size)
-                    
-            # If all else fails, use system font
-            return pygame.font.Font(None, font_size)
+            # A path of None falls back to the system font
+            font = pygame.font.Font(self._asset_index.get(font_name), font_size)
+            self._font_cache[(font_name, font_size)] = font
+            return font
         except Exception as e:
             print(f"Error loading font {font_name}: {e}")
             return None
@@ -232,6 +263,27 @@ class SettingsScreen:
         font_config = self.config['fonts'][font_key]
         return self._load_font(font_config['name'], font_config['size'])
 
+    def _render_cached(self, text, font_key, color):
+        """Render text with a configured font, reusing the surface on later calls."""
+        key = (text, font_key, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = self._fonts[font_key].render(text, True, color).convert_alpha()
+            self._text_cache[key] = surface
+        return surface
+
+    def _prewarm_text_cache(self):
+        """Render every string the settings screen can show into the text cache."""
+        color = self.primary_text_color
+        self._render_cached("CAESARS CHESS", 'title', color)
+        self._render_cached("BEGIN", 'title', color)
+        self._render_cached("GAME SETTINGS", 'subtitle', color)
+        for title, instruction, setting_key in self.sections:
+            max_desc_width = self.screen_width - self._render_cached(title, 'section_title', color).get_width() - 80
+            for option in self.options[setting_key]:
+                self._render_cached(option['label'], 'button', color)
+                self._description_block(setting_key, option, max_desc_width)
+
     def _find_assets_folder(self):
         """Find the assets folder."""
         possible_paths = [
@@ -247,10 +299,53 @@ class SettingsScreen:
         
         for path in possible_paths:
             if os.path.exists(path):
+                # Remember which font folders exist so font lookups only probe those
+                font_dirs = [os.path.join(path, "Cinzel", "static"), os.path.join(path, "Cormorant", "static")]
+                self._font_search_dirs = [path] + [d for d in font_dirs if os.path.isdir(d)]
                 return path
                 
         return None
     
+    def _build_asset_index(self):
+        """Map asset file names to paths with one directory scan per search folder.
+
+        Files in the assets folder itself take priority over the font subfolders.
+        """
+        asset_index = {}
+        for search_dir in self._font_search_dirs:
+            try:
+                with os.scandir(search_dir) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            asset_index.setdefault(entry.name, entry.path)
+            except OSError as e:
+                print(f"Could not scan assets folder {search_dir}: {e}")
+        return asset_index
+
+    def _preload_assets(self):
+        """Ask the OS to read ahead every font and image the screen is about to load.
+
+        The loads below then hit the page cache instead of paying a separate
+        cold read per file. A no-op where posix_fadvise is unavailable.
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        names = {font['name'] for font in self.config['fonts'].values()}
+        names.update(("parchment.png", "parchment.jpeg", "texture.png", "background.png",
+                      "separator.png", "corner.png"))
+        for name in names:
+            path = self._asset_index.get(name)
+            if path is None:
+                continue
+            try:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            except OSError:
+                pass
+
     def _load_background(self):
         """Load the parchment background."""
         if not self.assets_folder:
@@ -260,8 +355,16 @@ class SettingsScreen:
         
         for texture_name in possible_textures:
             try:
-                texture_path = os.path.join(self.assets_folder, texture_name)
-                if os.path.exists(texture_path):
+                texture_path = self._asset_index.get(texture_name)
+                if texture_path:
+                    # Reuse the composite saved by a previous launch if the texture hasn't changed;
+                    # the path hash keeps different checkouts from sharing one cache file
+                    path_hash = hashlib.sha1(os.path.abspath(texture_path).encode('utf-8')).hexdigest()[:12]
+                    cache_name = f"cchess_bg_{os.path.splitext(texture_name)[0]}_{path_hash}_{self.screen_width}x{self.screen_height}.png"
+                    cache_path = os.path.join(tempfile.gettempdir(), cache_name)
+                    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(texture_path):
+                        return pygame.image.load(cache_path).convert()
+
                     texture = pygame.image.load(texture_path).convert()
                     texture.set_alpha(255)  # Set 25% opacity
                     background = pygame.transform.scale(texture, (self.screen_width, self.screen_height))
@@ -271,6 +374,11 @@ class SettingsScreen:
                     white_overlay.fill((255, 255, 255))
                     background.blit(white_overlay, (0, 0))
 
+                    try:
+                        pygame.image.save(background, cache_path)
+                    except Exception as e:
+                        print(f"Could not cache background: {e}")
+
                     return background
             except Exception as e:
                 print(f"Could not load background: {e}")
@@ -278,7 +386,7 @@ class SettingsScreen:
         # Create a fallback parchment-like surface if no image is found
         fallback = pygame.Surface((self.screen_width, self.screen_height))
         fallback.fill((245, 235, 220))  # Light beige/parchment color
-        return fallback
+        return fallback.convert()
 
     
     def _load_separator(self):
@@ -286,8 +394,8 @@ class SettingsScreen:
         try:
             # Try to load a separator image from assets
             if self.assets_folder:
-                separator_path = os.path.join(self.assets_folder, "separator.png")
-                if os.path.exists(separator_path):
+                separator_path = self._asset_index.get("separator.png")
+                if separator_path:
                     try:
                         separator = pygame.image.load(separator_path).convert_alpha()
                         # Resize the separator to 144x20 as specified
@@ -298,22 +406,22 @@ class SettingsScreen:
             # Create a simple separator (resized to 144x20)
             separator = pygame.Surface((172,23), pygame.SRCALPHA)
             separator_rect = pygame.Rect(0, 10, 172, 2)
-            pygame.draw.rect(separator, self.colors['button_border'], separator_rect)
+            pygame.draw.rect(separator, self.button_border_color, separator_rect)
             
             # Add decorative elements to the separator
             circle_radius = 5
-            pygame.draw.circle(separator, self.colors['button_border'], (72, 10), circle_radius)
-            pygame.draw.circle(separator, self.colors['button_border'], (30, 10), circle_radius)
-            pygame.draw.circle(separator, self.colors['button_border'], (114, 10), circle_radius)
+            pygame.draw.circle(separator, self.button_border_color, (72, 10), circle_radius)
+            pygame.draw.circle(separator, self.button_border_color, (30, 10), circle_radius)
+            pygame.draw.circle(separator, self.button_border_color, (114, 10), circle_radius)
             
-            return separator
+            return separator.convert_alpha()
             
         except Exception as e:
             print(f"Error in _load_separator: {e}")
             # Return a minimal surface as fallback
             try:
                 fallback = pygame.Surface((144, 20), pygame.SRCALPHA)
-                return fallback
+                return fallback.convert_alpha()
             except:
                 return None
             
@@ -322,8 +430,8 @@ class SettingsScreen:
         try:
             # Try to load a corner image from assets
             if self.assets_folder:
-                corner_path = os.path.join(self.assets_folder, "corner.png")
-                if os.path.exists(corner_path):
+                corner_path = self._asset_index.get("corner.png")
+                if corner_path:
                     try:
                         corner_img = pygame.image.load(corner_path).convert_alpha()
                         return pygame.transform.scale(corner_img, (100, 100))
@@ -333,24 +441,18 @@ class SettingsScreen:
             # Create a simple corner decoration if image not found
             corner = pygame.Surface((50, 50), pygame.SRCALPHA)
             # Draw L shape
-            pygame.draw.rect(corner, self.colors['button_border'], (0, 0, 40, 5))
-            pygame.draw.rect(corner, self.colors['button_border'], (0, 0, 5, 40))
-            return corner
+            pygame.draw.rect(corner, self.button_border_color, (0, 0, 40, 5))
+            pygame.draw.rect(corner, self.button_border_color, (0, 0, 5, 40))
+            return corner.convert_alpha()
             
         except Exception as e:
             print(f"Error in _load_corner: {e}")
             # Return a minimal surface as fallback
             fallback = pygame.Surface((10, 10), pygame.SRCALPHA)
-            return fallback
+            return fallback.convert_alpha()
     
     def run(self):
         """Run the settings screen loop."""
-        # Ensure critical attributes exist
-        if not hasattr(self, 'buttons'):
-            self.buttons = {}
-        if not hasattr(self, 'active_button'):
-            self.active_button = None
-            
         running = True
         
         while running:
@@ -368,20 +470,43 @@ class SettingsScreen:
                         
                 # Reset active button on mouse up
                 if event.type == pygame.MOUSEBUTTONUP:
-                    if hasattr(self, 'active_button'):
-                        self.active_button = None
-                    else:
-                        self.active_button = None  # Create it if it doesn't exist
-            
-            # Draw the screen
-            self._draw_screen()
+                    self._mark_button_dirty(self.active_button)
+                    self.active_button = None
+
+                # Hover colours only change when the pointer crosses a button edge
+                if event.type == pygame.MOUSEMOTION:
+                    hovered_button = self._button_at(event.pos)
+                    if hovered_button != self._hovered_button:
+                        self._mark_button_dirty(self._hovered_button)
+                        self._mark_button_dirty(hovered_button)
+                        self._hovered_button = hovered_button
+
+                # The window contents may have been lost, so repaint everything
+                if event.type in self._EXPOSE_EVENTS:
+                    self._dirty = True
             
-            # Update display
-            pygame.display.flip()
+            if self._dirty:
+                # Draw the screen
+                self._draw_screen()
+                
+                # Update display
+                pygame.display.flip()
+                self._dirty = False
+                self._dirty_rects.clear()
+            elif self._dirty_rects:
+                # Repaint once, clipped to the area covering every changed button
+                dirty_area = self._dirty_rects[0].unionall(self._dirty_rects[1:])
+                self.screen.set_clip(dirty_area)
+                self._draw_screen()
+                self.screen.set_clip(None)
+                pygame.display.update(dirty_area)
+                self._dirty_rects.clear()
             
             # Check if user clicked start game
             if self._check_start_game():
                 running = False
+
+            self._clock.tick(30)
         
         # Clean up before returning settings
         pygame.quit()
@@ -407,17 +532,17 @@ class SettingsScreen:
         self._draw_corners()
    
         # Draw title "CAESARS CHESS"
-        title_text = self.cinzel_decorative_bold.render("CAESARS CHESS", True, self.colors['primary_text'])
+        title_text = self._render_cached("CAESARS CHESS", 'title', self.primary_text_color)
         title_rect = title_text.get_rect(center=(self.screen_width // 2, self.padding['top'] + 20))
         self.screen.blit(title_text, title_rect)
                 
         # Draw subtitle "GAME SETTINGS"
-        subtitle_text = self.cinzel_regular.render("GAME SETTINGS", True, self.colors['primary_text'])
+        subtitle_text = self._render_cached("GAME SETTINGS", 'subtitle', self.primary_text_color)
         subtitle_rect = subtitle_text.get_rect(center=(self.screen_width // 2, self.padding['top'] + 55))
         self.screen.blit(subtitle_text, subtitle_rect)
                 
         # Draw separator
-        if hasattr(self, 'separator') and self.separator is not None:
+        if self.separator is not None:
             try:
                 separator_rect = self.separator.get_rect(center=(self.screen_width // 2, self.padding['top'] + 80))
                 self.screen.blit(self.separator, separator_rect)
@@ -425,93 +550,120 @@ class SettingsScreen:
                 print(f"Error drawing separator: {e}")
        
         # Draw the four settings sections
-        base_y = self.config['positions']['section_start_y']
-        section_gap = self.config['positions']['section_gap']
-
-        # Replace with more detailed diagnostics
-        if hasattr(self, 'options'):
-            try:
-                self._draw_section("SWITCH TRIGGER MODE", "INSTRUCTION", 'switch_trigger_mode', self.padding['top'] + base_y)
-                self._draw_section("SWITCH MODE", "INSTRUCTION", 'switch_mode', self.padding['top'] + base_y + section_gap)
-                self._draw_section("GAME MODE", "INSTRUCTION", 'game_mode', self.padding['top'] + base_y + section_gap * 2)
-                self._draw_section("TOKEN MECHANIC", "INSTRUCTION", 'use_tokens', self.padding['top'] + base_y + section_gap * 3)
-            except Exception as e:
-                print(f"Error drawing sections: {e}")
-                # Draw error message with details
-                error_font = pygame.font.Font(None, 30)
-                error_text = error_font.render(f"Error: {str(e)[:50]}", True, (255, 0, 0))
-                error_rect = error_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
-                self.screen.blit(error_text, error_rect)
-        else:
-            print("Warning: Cannot draw settings sections, options not initialized")
-            # Draw fallback message
+        try:
+            for title, instruction, setting_key in self.sections:
+                self._draw_section(title, instruction, setting_key, self._section_layouts[setting_key]['y_pos'])
+        except Exception as e:
+            print(f"Error drawing sections: {e}")
+            # Draw error message with details
             error_font = pygame.font.Font(None, 30)
-            error_text = error_font.render("Settings could not be loaded properly", True, (255, 0, 0))
+            error_text = error_font.render(f"Error: {str(e)[:50]}", True, (255, 0, 0))
             error_rect = error_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
             self.screen.blit(error_text, error_rect)
 
         # Draw Begin button
         self._draw_begin_button()
     
-    def _draw_corners(self):
-        """Draw corner decorations at each corner of the screen."""
-        # First check if self.corner exists and is not None
-        if not hasattr(self, 'corner') or self.corner is None:
-            return
-            
-        try:
-            corner_size = self.corner.get_width()
-            padding = 10  # Reduced padding from the edge of the screen
-            
+    def _precompute_layouts(self):
+        """Compute each section's container, button rects, labels and shadows once."""
+        self._section_layouts = {}
+        self._button_rows = []
+        base_y = self.section_start_y
+        section_gap = self.section_gap
+        button_gap = self.button_gap
+
+        for index, (title, instruction, setting_key) in enumerate(self.sections):
+            y_pos = self.padding['top'] + base_y + section_gap * index
+
+            # Size each button from its label plus padding
+            labels = [self._render_cached(option['label'], 'button', self.primary_text_color)
+                      for option in self.options[setting_key]]
+            sizes = [(label.get_width() + 2 * 20, label.get_height() + 2 * 7) for label in labels]
+
+            # Centre the row of buttons below the section title
+            total_buttons_width = sum(w for w, _ in sizes) + button_gap * (len(sizes) - 1)
+            x = (self.screen_width - total_buttons_width) // 2
+            buttons_y = y_pos + 12
+
+            buttons = []
+            hits = []
+            for i, (option, label_surface, (button_width, button_height)) in enumerate(zip(self.options[setting_key], labels, sizes)):
+                button_rect = pygame.Rect(x, buttons_y, button_width, button_height)
+
+                # Buttons of the same size share one pre-drawn shadow
+                shadow_surface = self._get_button_shadow(button_width, button_height)
+
+                button_id = f"{setting_key}_{i}"
+                buttons.append((button_id, option, button_rect, label_surface, shadow_surface))
+                x += button_width + button_gap
+
+                # Store button for click detection
+                self.buttons[button_id] = {'rect': button_rect, 'value': option['value'], 'setting': setting_key}
+                hits.append((button_id, button_rect, partial(self._select_option, button_id, setting_key, option['value'])))
+
+            # Vertical extent of the row, so clicks can skip other sections' buttons
+            row_bottom = buttons_y + max(h for _, h in sizes)
+            self._button_rows.append((buttons_y, row_bottom, hits))
+
+            # Container spans the content width, with title + description on top and buttons below
+            container_rect = pygame.Rect(self.padding['left'], y_pos - 30, self.content_width, 100)
+
+            self._section_layouts[setting_key] = {
+                'y_pos': y_pos,
+                'container_rect': container_rect,
+                # Full-width band holding everything the section draws, for partial redraws
+                'region': pygame.Rect(0, container_rect.top, self.screen_width, container_rect.height),
+                'buttons': buttons
+            }
+
+    def _orient_corners(self, corner):
+        """Return (surface, position) pairs for the corner decoration at all four screen corners."""
+        corner_size = corner.get_width()
+        right_x = self.screen_width - corner_size - self.padding['right']
+        bottom_y = self.screen_height - corner_size - self.padding['bottom']
+        return (
             # Top-left corner
-            self.screen.blit(self.corner, (self.padding['left'], self.padding['top']))
-                    
+            (corner, (self.padding['left'], self.padding['top'])),
             # Top-right corner (flip horizontally)
-            top_right = pygame.transform.flip(self.corner, True, False)
-            self.screen.blit(top_right, (self.screen_width - corner_size - self.padding['right'], self.padding['top']))
-                    
+            (pygame.transform.flip(corner, True, False), (right_x, self.padding['top'])),
             # Bottom-left corner (flip vertically)
-            bottom_left = pygame.transform.flip(self.corner, False, True)
-            self.screen.blit(bottom_left, (self.padding['left'], self.screen_height - corner_size - self.padding['bottom']))
-                    
+            (pygame.transform.flip(corner, False, True), (self.padding['left'], bottom_y)),
             # Bottom-right corner (flip both horizontally and vertically)
-            bottom_right = pygame.transform.flip(self.corner, True, True)
-            self.screen.blit(bottom_right, (self.screen_width - corner_size - self.padding['right'], self.screen_height - corner_size - self.padding['bottom']))
+            (pygame.transform.flip(corner, True, True), (right_x, bottom_y))
+        )
+
+    def _get_button_shadow(self, width, height, border_radius=12):
+        """Return the rounded drop-shadow surface for a button size, drawing it on first use."""
+        shadow_surface = self._shadow_pool.get((width, height, border_radius))
+        if shadow_surface is None:
+            shadow_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(shadow_surface, (0, 0, 0, 64), pygame.Rect(0, 0, width, height), border_radius=border_radius)
+            shadow_surface = shadow_surface.convert_alpha()
+            self._shadow_pool[(width, height, border_radius)] = shadow_surface
+        return shadow_surface
+
+    def _draw_corners(self):
+        """Draw corner decorations at each corner of the screen."""
+        try:
+            for corner, position in self._corners:
+                self.screen.blit(corner, position)
         except Exception as e:
             print(f"Error drawing corners: {e}")
 
-    # Add this check at the beginning of _draw_section()
     def _draw_section(self, title, instruction, setting_key, y_pos):
         """Draw a settings section with the design styling."""
-        # Add defensive checks
-        if not hasattr(self, 'options'):
-            print(f"Warning: options attribute not found in _draw_section('{setting_key}')")
-            return
-            
-        if setting_key not in self.options:
-            print(f"Warning: setting key '{setting_key}' not found in options")
-            return
-
         # Use the configured section title font
-        section_title_font = self._load_font_from_config('section_title')
-        
-        title_text = section_title_font.render(title, True, self.colors['primary_text'])
+        title_text = self._render_cached(title, 'section_title', self.primary_text_color)
         
         # Position the title at a fixed left margin to make room for description on the right
-        container_width = self.config['elements']['section_container_width']
+        container_width = self.section_container_width
         title_width = title_text.get_width()
         
         # Calculate title x position to center the title+description container
-        if hasattr(self, 'options') and setting_key in self.options:
-            selected_option = next((opt for opt in self.options[setting_key] if opt['value'] == self.settings[setting_key]), None)
-        else:
-            print(f"Warning: options not available for {setting_key}")
-            selected_option = None
+        selected_option = self._option_by_value[setting_key].get(self.settings[setting_key])
         desc_width = 0
         if selected_option:
-            desc_font = self._load_font_from_config('section_description')
-            
-            desc_width = desc_font.size(selected_option['description'])[0] + 20  # Add spacing
+            desc_width = self._desc_width(selected_option['description']) + 20  # Add spacing
         
         # Calculate the combined width to center the entire section
         combined_width = min(title_width + desc_width, container_width)
@@ -520,254 +672,217 @@ class SettingsScreen:
         # Draw title at its calculated position
         self.screen.blit(title_text, (title_x, y_pos-20))
         
-        # Draw options as buttons
-        num_options = len(self.options[setting_key])
-        total_width = self.config['elements']['section_container_width']
-        button_gap = self.config['elements']['button_gap']
-        
-        # Dynamically calculate button widths based on text + padding
-        cormorant_unicase_medium = self._load_font_from_config('button')
-        button_heights = []
-        button_rects = []
-
-        for i, option in enumerate(self.options[setting_key]):
-            label_text = option['label']
-            label_surface = cormorant_unicase_medium.render(label_text, True, self.colors['primary_text'])
-            text_width, text_height = label_surface.get_size()
-            button_width = text_width + 2 * 20  # 5px horizontal padding on each side
-            button_height = text_height + 2 * 7  # 10px vertical padding on top and bottom
-            button_heights.append(button_height)
-            button_rects.append((button_width, label_surface))  # Store width and surface for reuse
-
-        
-        # Position buttons
-        total_buttons_width = sum(w for w, _ in button_rects) + button_gap * (num_options - 1)
-        start_x = (self.screen_width - total_buttons_width) // 2
-        buttons_y = y_pos + 12
-        
-        # Adjust container to accommodate title + description on top and buttons below
-        section_top = y_pos - 30
-        section_height = 100  # Maintain the same height
-        
-        # Create the container rect that spans the full width (respecting padding)
-        container_x = self.padding['left']
-        container_width = self.content_width
-        container_rect = pygame.Rect(container_x, section_top, container_width, section_height)
-
-        # Add padding to the container rect
-        inner_rect = container_rect.inflate(-20, -20)  # 10px padding on each side
-        
         # Draw the container border
-        pygame.draw.rect(self.screen, self.colors['button_border'], container_rect, width=1)
-
-        # Continue with the rest of the method using config values...
+        layout = self._section_layouts[setting_key]
+        pygame.draw.rect(self.screen, self.button_border_color, layout['container_rect'], width=1)
 
-        if not hasattr(self, 'options') or setting_key not in self.options:
-            print(f"Warning: cannot draw buttons for {setting_key} - options not available")
-            return
-            
-        for i, option in enumerate(self.options[setting_key]):
-                x = start_x + sum(button_rects[j][0] + button_gap for j in range(i))
-                button_width, label_surface = button_rects[i]
-                button_height = button_heights[i]
-                button_rect = pygame.Rect(x, buttons_y, button_width, button_height)
-                
+        for button_id, option, button_rect, label_surface, shadow_surface in layout['buttons']:
                 # Determine if this option is selected
                 is_selected = self.settings[setting_key] == option['value']
                 
-                # Check for mouse hover
-                mouse_pos = pygame.mouse.get_pos()
-                is_hovered = button_rect.collidepoint(mouse_pos)
+                # Hover state is tracked from mouse motion events in run()
+                is_hovered = self._hovered_button == button_id
                 
                 # Check for active button (being clicked)
-                button_id = f"{setting_key}_{i}"
-                is_active = hasattr(self, 'active_button') and self.active_button == button_id
+                is_active = self.active_button == button_id
                 
                 # Choose button color based on state
                 if is_active:
-                    button_color = self.colors['button_selected']
+                    button_color = self.button_selected_color
                 elif is_selected:
-                    button_color = self.colors['button_selected']
+                    button_color = self.button_selected_color
                 elif is_hovered:
-                    button_color = self.colors['button_hover']
+                    button_color = self.button_hover_color
                 else:
-                    button_color = self.colors['button_bg']
+                    button_color = self.button_bg_color
                 
-                # Draw button with improved drop shadow
-                shadow_rect = pygame.Rect(x, buttons_y + 1, button_width, button_height)
-                shadow_surface = pygame.Surface((button_width, button_height), pygame.SRCALPHA)
-                pygame.draw.rect(shadow_surface, (0, 0, 0, 64), pygame.Rect(0, 0, button_width, button_height), border_radius=12)
-                # Apply blur effect for shadow (simple approximation)
-                self.screen.blit(shadow_surface, (x, buttons_y + 1))
+                # Draw button with its pre-rendered drop shadow
+                self.screen.blit(shadow_surface, (button_rect.x, button_rect.y + 1))
                 # Draw the actual button with padding
                 pygame.draw.rect(self.screen, button_color, button_rect, border_radius=12)
-                pygame.draw.rect(self.screen, self.colors['button_border'], button_rect, 1, border_radius=12)
-                
-                # Draw button text with correct font and padding
-                cormorant_unicase_medium = self._load_font_from_config('button')
-                option_text = cormorant_unicase_medium.render(option['label'], True, self.colors['primary_text'])
-                # Add padding between button edges and text (5px horizontal, 10px vertical)
-                option_text_rect = option_text.get_rect(center=button_rect.center)
-                self.screen.blit(option_text, option_text_rect)
+                pygame.draw.rect(self.screen, self.button_border_color, button_rect, 1, border_radius=12)
                 
-                # Store button for click detection
-                self.buttons[button_id] = {'rect': button_rect, 'value': option['value'], 'setting': setting_key}
+                # Draw the pre-rendered button label centred in the button
+                option_text_rect = label_surface.get_rect(center=button_rect.center)
+                self.screen.blit(label_surface, option_text_rect)
+
+        # Draw description for selected option to the right of the title
+        if selected_option:
+            # Implement text wrapping for description
+            max_desc_width = self.screen_width - title_width - 80  # Allow some margin
+            desc_block = self._description_block(setting_key, selected_option, max_desc_width)
+
+            # Measure total width of title + spacing + description
+            spacing = 20
+            combined_width = title_width + spacing + self._desc_width(selected_option['description'])
+
+            # Calculate centered x for the entire block
+            desc_x = (self.screen_width - combined_width) // 2 + title_width + spacing
+
+            self.screen.blit(desc_block, (desc_x, y_pos - 20))
+
+    def _wrap_description(self, setting_key, option, max_desc_width):
+        """Split an option's description into lines no wider than max_desc_width, once per option."""
+        key = (setting_key, option['value'], max_desc_width)
+        lines = self._wrap_cache.get(key)
+        if lines is not None:
+            return lines
+
+        words = option['description'].split()
+        space_width = self._desc_width(' ')
+        lines = []
+        current_line = []
+        current_width = 0
+        
+        # Simple text wrapping implementation, measuring each word once
+        for word in words:
+            word_width = self._desc_width(word)
+            test_width = current_width + space_width + word_width if current_line else word_width
             
-                # Draw description for selected option to the right of the title
-                if hasattr(self, 'options') and setting_key in self.options:
-                    selected_option = next((opt for opt in self.options[setting_key] if opt['value'] == self.settings[setting_key]), None)
-                else:
-                    print(f"Warning: options not available for {setting_key}")
-                    selected_option = None
-                if selected_option:
-                    # Create description text with new font size (20px)
-                    desc_font = self._load_font_from_config('section_description')
-                    
-                    # Get the width of the title to position the description
-                    title_width = title_text.get_width()
-                    
-                    # Implement text wrapping for description
-                    max_desc_width = self.screen_width - title_width - 80  # Allow some margin
-                    words = selected_option['description'].split()
-                    lines = []
-                    current_line = []
-                    
-                    # Simple text wrapping implementation
-                    for word in words:
-                        test_line = ' '.join(current_line + [word])
-                        test_width = desc_font.size(test_line)[0]
-                        
-                        if test_width <= max_desc_width:
-                            current_line.append(word)
-                        else:
-                            lines.append(' '.join(current_line))
-                            current_line = [word]
-                    
-                    if current_line:
-                        lines.append(' '.join(current_line))
-                    
-                    # Position and render each line
-                    if not lines:  # Fallback if wrapping failed
-                        lines = [selected_option['description']]
-                        
-                    # Position the description to the right of the title
-                    # Load description font
-                    desc_font = self._load_font_from_config('section_description')
-                    desc_surface = desc_font.render(selected_option['description'], True, self.colors['primary_text'])
+            # A word wider than the whole line still goes on a line of its own
+            if test_width <= max_desc_width or not current_line:
+                current_line.append(word)
+                current_width = test_width
+            else:
+                lines.append(' '.join(current_line))
+                current_line = [word]
+                current_width = word_width
+        
+        if current_line:
+            lines.append(' '.join(current_line))
+        
+        if not lines:  # Fallback if wrapping failed
+            lines = [option['description']]
 
-                    # Measure total width of title + spacing + description
-                    spacing = 20
-                    combined_width = title_text.get_width() + spacing + desc_surface.get_width()
+        self._wrap_cache[key] = lines
+        return lines
 
-                    # Calculate centered x for the entire block
-                    combined_x = (self.screen_width - combined_width) // 2
-                    title_x = combined_x
-                    desc_x = title_x + title_text.get_width() + spacing
+    def _description_block(self, setting_key, option, max_desc_width):
+        """Return an option's wrapped description as one pre-composed surface."""
+        key = (setting_key, option['value'], max_desc_width)
+        block = self._desc_block_cache.get(key)
+        if block is None:
+            lines = [self._render_cached(line, 'section_description', self.primary_text_color)
+                     for line in self._wrap_description(setting_key, option, max_desc_width)]
+            line_height = 30
+            block = pygame.Surface((max(line.get_width() for line in lines),
+                                    line_height * (len(lines) - 1) + lines[-1].get_height()), pygame.SRCALPHA)
+            for i, line in enumerate(lines):
+                block.blit(line, (0, i * line_height))
+            block = block.convert_alpha()
+            self._desc_block_cache[key] = block
+        return block
 
-                    
-                    for i, line in enumerate(lines):
-                        desc_text = desc_font.render(line, True, self.colors['primary_text'])
-                        desc_y = y_pos - 20 + (i * 30)  # 25px line height
-                        self.screen.blit(desc_text, (desc_x, desc_y))
+    def _desc_width(self, text):
+        """Return the rendered width of text in the description font, measuring it once."""
+        width = self._desc_width_cache.get(text)
+        if width is None:
+            width = self._desc_width_cache[text] = self._fonts['section_description'].size(text)[0]
+        return width
+
+    def _build_begin_button(self):
+        """Compute the Begin button geometry and label once and register it for click detection."""
+        button_width = self.begin_button_width
+        button_height = self.begin_button_height
+        button_rect = pygame.Rect((self.screen_width - button_width) // 2, self.screen_height - self.padding['bottom'] - button_height, button_width, button_height)
+        begin_text = self._render_cached("BEGIN", 'title', self.primary_text_color)
+        self._begin_button = {
+            'rect': button_rect,
+            'shadow': self._get_button_shadow(button_width, button_height, border_radius=10),
+            'shadow_pos': (button_rect.x, button_rect.y + 1),
+            'text': begin_text,
+            'text_rect': begin_text.get_rect(center=button_rect.center)
+        }
+
+        # Store button for click detection
+        self.buttons['begin'] = {'rect': button_rect}
+        self._begin_hit = ('begin', button_rect, self._press_begin)
 
-    
     def _draw_begin_button(self):
         """Draw the Begin button at the bottom of the screen."""
-        button_width = self.config['elements']['begin_button_width']
-        button_height = self.config['elements']['begin_button_height']
-        # Modified code
-        button_rect = pygame.Rect((self.screen_width - button_width) // 2, self.screen_height - self.padding['bottom'] - button_height, button_width, button_height)
+        begin_button = self._begin_button
+        button_rect = begin_button['rect']
         
-        # Check for mouse hover
-        mouse_pos = pygame.mouse.get_pos()
-        is_hovered = button_rect.collidepoint(mouse_pos)
-        is_active = hasattr(self, 'active_button') and self.active_button == 'begin'
+        # Hover state is tracked from mouse motion events in run()
+        is_hovered = self._hovered_button == 'begin'
+        is_active = self.active_button == 'begin'
         
         # Draw button with drop shadow
-        shadow_rect = pygame.Rect(
-            (self.screen_width - button_width) // 2,
-            self.screen_height - self.padding['bottom'] - button_height + 1,
-            button_width,
-            button_height
-        )
-
-        pygame.draw.rect(self.screen, (0, 0, 0, 64), shadow_rect, border_radius=10)
+        self.screen.blit(begin_button['shadow'], begin_button['shadow_pos'])
         
         # Choose button color based on state
         if is_active:
-            button_color = self.colors['button_selected']
+            button_color = self.button_selected_color
         elif is_hovered:
-            button_color = self.colors['button_hover']
+            button_color = self.button_hover_color
         else:
             button_color = (252, 247, 243)  # #FCF7F3 for Begin button only
 
-        
         pygame.draw.rect(self.screen, button_color, button_rect, border_radius=5)
-        pygame.draw.rect(self.screen, self.colors['button_border'], button_rect, 1, border_radius=5)
+        pygame.draw.rect(self.screen, self.button_border_color, button_rect, 1, border_radius=5)
         
         # Draw button text
-        begin_text = self.cinzel_decorative_bold.render("BEGIN", True, self.colors['primary_text'])
-        begin_text_rect = begin_text.get_rect(center=button_rect.center)
-        self.screen.blit(begin_text, begin_text_rect)
-        
-        # Store button for click detection
-        self.buttons['begin'] = button_rect
+        self.screen.blit(begin_button['text'], begin_button['text_rect'])
     
+    def _hit_test(self, pos):
+        """Return the (button id, handler) pair for the button under pos, or (None, None)."""
+        mouse_y = pos[1]
+        button_id, button_rect, handler = self._begin_hit
+        # The Begin button sits below every section row, so most positions fail on y alone
+        if mouse_y >= button_rect.top and button_rect.collidepoint(pos):
+            return button_id, handler
+
+        # Only hit-test the buttons of the row the position falls in
+        for row_top, row_bottom, hits in self._button_rows:
+            if not row_top <= mouse_y < row_bottom:
+                continue
+            for button_id, button_rect, handler in hits:
+                if button_rect.collidepoint(pos):
+                    return button_id, handler
+            break
+        return None, None
+
+    def _button_at(self, pos):
+        """Return the id of the button under pos, or None."""
+        return self._hit_test(pos)[0]
+
+    def _mark_button_dirty(self, button_id):
+        """Queue a button's area, including its drop shadow, for a partial redraw."""
+        if button_id not in self.buttons:
+            return
+        button_rect = self.buttons[button_id]['rect']
+        self._dirty_rects.append(button_rect.union(button_rect.move(0, 1)))
+
     def _handle_click(self, mouse_pos):
         """Handle mouse clicks on buttons."""
+        handler = self._hit_test(mouse_pos)[1]
+        if handler is not None:
+            handler()
 
-        for button_id, button_data in self.buttons.items():
-            if button_id == 'begin':
-                if button_data.collidepoint(mouse_pos):
-                    self.active_button = 'begin'
-                    self.start_game = True
-                    return
-            else:
-                if isinstance(button_data, dict) and 'rect' in button_data and button_data['rect'].collidepoint(mouse_pos):
-                    self.active_button = button_id
-                    if hasattr(self, 'settings') and 'setting' in button_data and 'value' in button_data:
-                        self.settings[button_data['setting']] = button_data['value']
-                    else:
-                        print(f"Warning: Cannot update setting for {button_id}")
-                    # If it's random token mode, generate new random moves
-                    if button_data['setting'] == 'switch_trigger_mode' and button_data['value'] == 'random_token':
-                        self.random_token_moves = [
-                            random.randint(5, 20),    # Early game
-                            random.randint(20, 45),   # Mid game
-                            random.randint(45, 70)    # Late game
-                        ]
-                    return
+    def _press_begin(self):
+        """Start the game from the Begin button."""
+        self.active_button = 'begin'
+        self.start_game = True
+        self._mark_button_dirty('begin')
+
+    def _select_option(self, button_id, setting_key, value):
+        """Apply the option behind a section button."""
+        self.active_button = button_id
+        self.settings[setting_key] = value
+        # If it's random token mode, generate new random moves
+        if setting_key == 'switch_trigger_mode' and value == 'random_token':
+            self.random_token_moves = self._roll_token_moves()
+        # The selection moves the title and description, so repaint the whole section band
+        self._dirty_rects.append(self._section_layouts[setting_key]['region'])
     
+    @staticmethod
+    def _roll_token_moves():
+        """Pick one trigger move from each of the configured early/mid/late game windows."""
+        return [random.randint(low, high) for low, high in configuration.RANDOM_TOKEN_RANGES]
+
     def _check_start_game(self):
         """Check if the start game button was clicked."""
-        return hasattr(self, 'start_game') and self.start_game
-
-    def _ensure_attributes(self):
-        """Ensure all required attributes exist, creating them if missing."""
-        critical_attributes = {
-            'buttons': {},
-            'active_button': None,
-            'corner': None,
-            'separator': None,
-            'start_game': False,
-            'options': self.options if hasattr(self, 'options') else {},
-            'settings': self.settings if hasattr(self, 'settings') else {
-                'switch_trigger_mode': "move",
-                'switch_mode': 2,
-                'game_mode': "User vs AI",
-                'use_tokens': True
-            },
-            'random_token_moves': self.random_token_moves if hasattr(self, 'random_token_moves') else [
-                random.randint(5, 20),
-                random.randint(20, 45),
-                random.randint(45, 70)
-            ]
-        }
-        
-        for attr, default_value in critical_attributes.items():
-            if not hasattr(self, attr):
-                print(f"Warning: Missing attribute '{attr}'. Initializing with default value.")
-                setattr(self, attr, default_value)
+        return self.start_game
 
 # For testing the settings screen directly
 if __name__ == "__main__":
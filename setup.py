@@ -1,75 +1,46 @@
 """
 Setup script for Caesar's Chess
-Installs required packages for the game.
+Checks that the game's packages and files are in place.
 """
 
-import subprocess
-import sys
+import importlib.util
 import os
 
-def check_pygame():
-    """Check if pygame is installed, install if not."""
-    try:
-        import pygame
-        print("✓ Pygame is already installed.")
-        return True
-    except ImportError:
-        print("Pygame not found. Installing...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "pygame"])
-            print("✓ Pygame installed successfully.")
-            return True
-        except Exception as e:
-            print(f"Error installing Pygame: {e}")
-            return False
+# Import name of each package listed in install_requires below
+REQUIRED_MODULES = {
+    "pygame": "Pygame",
+    "chess": "Python-chess",
+    "matplotlib": "Matplotlib",
+    "numpy": "NumPy"
+}
 
-def check_chess():
-    """Check if python-chess is installed, install if not."""
-    try:
-        import chess
-        print("✓ Python-chess is already installed.")
-        return True
-    except ImportError:
-        print("Python-chess not found. Installing...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "python-chess"])
-            print("✓ Python-chess installed successfully.")
-            return True
-        except Exception as e:
-            print(f"Error installing Python-chess: {e}")
-            return False
+# Game files that must sit next to this script
+REQUIRED_FILES = frozenset({
+    "settings_screen.py",
+    "launcher.py",
+    "configuration.py",
+    "game.py",
+    "chess_view.py",
+    "event_handler.py"
+})
 
-def check_matplotlib():
-    """Check if matplotlib is installed, install if not."""
-    try:
-        import matplotlib
-        print("✓ Matplotlib is already installed.")
-        return True
-    except ImportError:
-        print("Matplotlib not found. Installing...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "matplotlib"])
-            print("✓ Matplotlib installed successfully.")
-            return True
-        except Exception as e:
-            print(f"Error installing Matplotlib: {e}")
-            return False
+def check_packages():
+    """Check that the required packages are installed without importing them."""
+    missing = [name for module, name in REQUIRED_MODULES.items() if importlib.util.find_spec(module) is None]
+    if missing:
+        print("Missing required packages: " + ", ".join(missing))
+        print("Install them with: pip install -e .")
+        return False
+
+    print("✓ All required packages are installed.")
+    return True
 
 def check_files():
     """Check if required files are present."""
-    required_files = [
-        "settings_screen.py",
-        "launcher.py",
-        "configuration.py",
-        "game.py",
-        "chess_view.py",
-        "event_handler.py"
-    ]
-    
-    missing_files = []
-    for file in required_files:
-        if not os.path.exists(file):
-            missing_files.append(file)
+    # One directory read instead of a stat per file
+    with os.scandir(".") as entries:
+        present = {entry.name for entry in entries}
+    missing_files = sorted(REQUIRED_FILES - present)
     
     if missing_files:
         print("Missing required files:")
@@ -81,21 +52,19 @@ def check_files():
     return True
 
 def main():
-    """Main function to check and install requirements."""
+    """Main function to check requirements."""
     print("Caesar's Chess Setup")
     print("===================")
     print("Checking requirements...")
     
-    # Check and install required packages
-    pygame_ok = check_pygame()
-    chess_ok = check_chess()
-    matplotlib_ok = check_matplotlib()
+    # Check required packages
+    packages_ok = check_packages()
     
     # Check required files
     files_ok = check_files()
     
     # Summary
-    if pygame_ok and chess_ok and matplotlib_ok and files_ok:
+    if packages_ok and files_ok:
         print("\nAll requirements satisfied!")
         print("You can now run the game with: python launcher.py")
     else:
@@ -1,21 +1,23 @@
 import chess
+import heapq
 import random
 import time
 import pygame
 from enum import Enum
-from evaluation import calculate_win_probability
+from evaluation import material_scores, piece_score, probability_from_scores
 import configuration
 import logging
-import sys
 from animation_handler import AnimationHandler
-import gc
+from contextlib import contextmanager
 
 from win_probability import (
     calculate_win_probability_enhanced, 
+    win_probability_from_analysis,
     WIN_PROBABILITY_MODE,
     USE_ENGINE_FOR_SWITCHING,
     USE_ENGINE_FOR_DISPLAY,
     ENGINE_ANALYSIS_TIME,
+    ENGINE_ERRORS,
     STABILITY_FACTOR_ENABLED,
     STABILITY_FACTOR_WEIGHT
 )
@@ -24,6 +26,20 @@ from uci_engine import EngineManager
 # Get the logger from configuration
 logger = configuration.logger
 
+# Entries kept in each SwitchManager's win probability cache before it is reset
+PROB_CACHE_SIZE = 4096
+# King-step distance between every pair of squares, indexed by a * 64 + b
+_KING_DIST = bytes(max(abs((a >> 3) - (b >> 3)), abs((a & 7) - (b & 7))) for a in range(64) for b in range(64))
+
+# Bitboard of the squares within two king steps of each square, for the protection rule
+_KING_ZONE = [
+    sum(chess.BB_SQUARES[other] for other in chess.SQUARES if _KING_DIST[square * 64 + other] <= 2)
+    for square in chess.SQUARES
+]
+
+# Pawns on their starting rank or one step from promotion are never switched
+_PAWN_EXCLUDED_RANKS = chess.BB_RANK_2 | chess.BB_RANK_7
+
 class SwitchState(Enum):
     IDLE = "idle"
     ANIMATION = "animation"
@@ -33,6 +49,14 @@ class SwitchState(Enum):
 class SwitchManager:
     """Handles all aspects of piece color switching in the chess game."""
 
+    __slots__ = ('board', 'animation_handler', 'game', 'is_active', 'sequence_active',
+                 'state', 'last_switched_squares', 'last_switched_color', 'switched_pieces',
+                 'switch_move_numbers', 'switch_highlight_start_time', 'promoted_pieces',
+                 'white_switch_count', 'black_switch_count', 'timer_start_time',
+                 'COLOR_SWITCH_TIMER_EVENT', '_use_enhanced', '_prob_cache', 'move_count', '_trigger_mode',
+                 '_last_printed_remaining', '_game_has_switch_mode',
+                 '_game_has_promoted')
+
     def __init__(self, board, animation_handler=None, game = None):
         self.board = board
         self.animation_handler = animation_handler
@@ -47,102 +71,92 @@ class SwitchManager:
         self.switched_pieces = set()
         self.switch_move_numbers = []
         self.switch_highlight_start_time = None
+        # Kept in step with game.move_count by the game; -1 when there is no game
+        self.move_count = game.move_count if game is not None and hasattr(game, 'move_count') else -1
+
+        # Win probabilities keyed by (evaluator, position key, flipped square)
+        self._prob_cache = {}
         
+        # What the game object provides, resolved once instead of on every switch
+        self._game_has_switch_mode = game is not None and hasattr(game, 'switch_mode')
+        self._game_has_promoted = game is not None and hasattr(game, 'promoted_pieces')
+
         # Access to promoted pieces info
         self.promoted_pieces = set()
-        if game and hasattr(game, 'promoted_pieces'):
+        if self._game_has_promoted:
             self.promoted_pieces = game.promoted_pieces
 
         # Counters
         self.white_switch_count = 0
         self.black_switch_count = 0
         
-        # Timer-based switching
+        # Timer-based switching; the trigger mode is fixed for the game before this is created
+        self._trigger_mode = configuration.SWITCH_TRIGGER_MODE
+        self._last_printed_remaining = None
         self.timer_start_time = pygame.time.get_ticks()
         self.COLOR_SWITCH_TIMER_EVENT = pygame.USEREVENT + 2
         
         # Initialize timer if needed
-        if configuration.SWITCH_TRIGGER_MODE == "timer":
+        if self._trigger_mode == "timer":
             pygame.time.set_timer(self.COLOR_SWITCH_TIMER_EVENT, configuration.SWITCH_TIMER_DURATION)
             logger.info(f"Timer-based switching initialized with duration: {configuration.SWITCH_TIMER_DURATION}ms")
             
-        # Initialize enhanced evaluation
-        self._initialize_enhanced_evaluation()
-
-    def _initialize_enhanced_evaluation(self):
-        """
-        Initialize enhanced win probability evaluation if configured.
-        Called during __init__ to ensure each instance uses the right evaluation method.
-        """
-        # Save the original method reference if not already saved
-        if not hasattr(self, '_original_evaluate_probability_change'):
-            self._original_evaluate_probability_change = self._evaluate_probability_change_safe
-        
-        # Replace with enhanced version only if configured to do so
-        if WIN_PROBABILITY_MODE != "material":
+        # Use enhanced evaluation for switch candidates unless configured for material only
+        self._use_enhanced = WIN_PROBABILITY_MODE != "material"
+        if self._use_enhanced:
             logger.info("Enhanced win probability evaluation enabled for switch manager")
-            # The self is already bound to the instance methods, no need for a wrapper
-            self._evaluate_probability_change_safe = self.evaluate_probability_change
+
+    def _probability_change(self, board, piece, square):
+        """Evaluates a switch's win probability change with the configured evaluation."""
+        if self._use_enhanced:
+            try:
+                return self.evaluate_probability_change(board, piece, square)
+            except ENGINE_ERRORS as e:
+                logger.error(f"Error in enhanced probability calculation: {e}")
+                # Fall back to original method
+        return self._evaluate_probability_change_safe(board, piece, square)
 
     def evaluate_probability_change(self, board, piece, square):
         """
         Enhanced version of _evaluate_probability_change_safe that can use
         engine evaluation if configured to do so.
         """
-        try:
-            # Get engine if needed
-            engine = None
-            if WIN_PROBABILITY_MODE == "engine":
-                engine_manager = EngineManager.get_instance()
-                engine = engine_manager.get_engine()
-            
-            # First, calculate probabilities with the original board state
-            original_white_prob, original_black_prob = calculate_win_probability_enhanced(
-                board, 
-                engine=engine,
-                use_engine= USE_ENGINE_FOR_SWITCHING
-            )
-            
-            # Create a temporary board copy for the simulation
-            temp_board = board.copy()
-            temp_piece = temp_board.piece_at(square)
-            if temp_piece:
-                temp_board.remove_piece_at(square)
-                temp_board.set_piece_at(square, chess.Piece(temp_piece.piece_type, not temp_piece.color))
-                
-            # Calculate probabilities with the simulated change
-            new_white_prob, new_black_prob = calculate_win_probability_enhanced(
-                temp_board, 
+        # Get engine if needed
+        engine = None
+        if WIN_PROBABILITY_MODE == "engine":
+            # The manager shares cached and in-flight analyses with the display
+            engine = EngineManager.get_instance()
+
+        def evaluate(eval_board):
+            return calculate_win_probability_enhanced(
+                eval_board, 
                 engine=engine,
                 use_engine= USE_ENGINE_FOR_SWITCHING
             )
+        
+        # First, calculate probabilities with the original board state,
+        # which is cached after the first candidate of a switch evaluation
+        original_white_prob, original_black_prob = self._cached_probs("enhanced", board, None, evaluate)
             
-            # Return the absolute differences in probabilities
-            return abs(new_white_prob - original_white_prob), abs(new_black_prob - original_black_prob)
-        except Exception as e:
-            logger.error(f"Error in enhanced probability calculation: {e}")
-            # Fall back to original method
-            return self._original_evaluate_probability_change(board, piece, square)
-
-    def restore_original_evaluation(self):
-        """
-        Restore the original _evaluate_probability_change_safe method.
-        """
-        if hasattr(self, '_original_evaluate_probability_change'):
-            self._evaluate_probability_change_safe = self._original_evaluate_probability_change
-            logger.info("Restored original win probability evaluation for switch manager")
+        # Calculate probabilities with the simulated change
+        new_white_prob, new_black_prob = self._cached_probs("enhanced", board, square, evaluate)
+        
+        # Return the absolute differences in probabilities
+        return abs(new_white_prob - original_white_prob), abs(new_black_prob - original_black_prob)
 
     def handle_switch_trigger(self):
             # Only check for timer-based switching if that mode is enabled and no switch sequence is active
-            if configuration.SWITCH_TRIGGER_MODE == "timer" and not self.game.switch_sequence_active:
+            if self._trigger_mode == "timer" and not self.game.switch_sequence_active:
                 time_elapsed = pygame.time.get_ticks() - self.game.timer_start_time
                 remaining_time = max(0, (configuration.SWITCH_TIMER_DURATION - time_elapsed) // 1000)
 
                 if remaining_time > 0:
-                    # Update the countdown timer on the game window 
-                    print(f"\rTime until switch: {remaining_time} seconds", end="")
-                    sys.stdout.flush()
+                    # Update the countdown only when the whole-second value changes
+                    if remaining_time != self._last_printed_remaining:
+                        self._last_printed_remaining = remaining_time
+                        print(f"\rTime until switch: {remaining_time} seconds", end="", flush=True)
                 elif remaining_time <= 0:
+                    self._last_printed_remaining = None
                     print("\n🔄 Timer-based switching triggered!")
                     self.game.find_switch_piece()  # Start the switch process
     
@@ -169,7 +183,7 @@ class SwitchManager:
     def check_random_token_trigger(self, move_count):
         """Check if a random token-based switch should be triggered."""
         if (not self.sequence_active and 
-            configuration.SWITCH_TRIGGER_MODE == "random_token" and
+            self._trigger_mode == "random_token" and
             hasattr(configuration, 'RANDOM_TOKEN_MOVES') and
             move_count in configuration.RANDOM_TOKEN_MOVES and
             move_count not in self.switch_move_numbers):
@@ -180,7 +194,7 @@ class SwitchManager:
     def restart_timer(self):
         """Restarts the switch timer."""
         self.timer_start_time = pygame.time.get_ticks()
-        if configuration.SWITCH_TRIGGER_MODE == "timer":
+        if self._trigger_mode == "timer":
             pygame.time.set_timer(self.COLOR_SWITCH_TIMER_EVENT, configuration.SWITCH_TIMER_DURATION)
             logger.debug(f"Switch timer restarted with duration: {configuration.SWITCH_TIMER_DURATION}ms")
    
@@ -192,7 +206,7 @@ class SwitchManager:
             return
         
         # Always use the game's switch_mode if available
-        if num_pieces is None and hasattr(self, 'game') and hasattr(self.game, 'switch_mode'):
+        if num_pieces is None and self._game_has_switch_mode:
             num_pieces = self.game.switch_mode
         elif num_pieces is None:
             num_pieces = configuration.DEFAULT_SWITCH_MODE
@@ -226,11 +240,10 @@ class SwitchManager:
         if self.animation_handler:
             self.animation_handler.start_animation()
         
-        # Highlight each square for switching WITHOUT changing colors
-        for square in best_squares:
-            self._highlight_piece_for_switch(square)
+        # Highlight the selected squares (already in last_switched_squares) WITHOUT changing colors
+        self.switch_highlight_start_time = time.time()
 
-        if hasattr(self, 'game'):
+        if self.game is not None:
             self.sync_state_to_game(self.game)
             
         return best_squares 
@@ -239,9 +252,6 @@ class SwitchManager:
         """Execute the color switch on selected pieces."""
         logger.info(f"switch_piece_color triggered at time {time.time()}")
 
-        # Store the current turn before executing the switch
-        current_turn = self.board.turn
-        
         # Ensure last_switched_squares is a list
         if not isinstance(self.last_switched_squares, list):
             self.last_switched_squares = [self.last_switched_squares]
@@ -269,14 +279,13 @@ class SwitchManager:
 
             logger.debug(f"Switching piece at {square} from {original_color} to {new_color}")
 
-            # Execute the actual switch
-            self.board.remove_piece_at(square)
+            # Execute the actual switch; set_piece_at replaces the piece and leaves the turn alone
             new_piece = chess.Piece(piece_type, new_color)
             self.board.set_piece_at(square, new_piece)
             print(f"Switch occurs! Piece at square {square} changed from {original_color} to {new_color}")
             
             # Record the switch
-            self.switch_move_numbers.append(self.move_count if hasattr(self, 'move_count') else -1)
+            self.switch_move_numbers.append(self.move_count)
             self.switched_pieces.add(square)
 
             # Update the switch counters
@@ -287,9 +296,6 @@ class SwitchManager:
 
             logger.info(f"Piece at square {square} changed color to {'white' if new_color else 'black'}")
 
-        # After all pieces are switched, restore the original player's turn
-        self.board.turn = current_turn
-        
         # Update last_switched_color based on the original colors of all switched pieces
         # For single-piece switching, this will be the color of the piece that was switched
         if switched_colors:
@@ -299,103 +305,101 @@ class SwitchManager:
             logger.info(f"Updated last_switched_color to {self.last_switched_color}")
                 
         # Restart the timer if in timer mode
-        if configuration.SWITCH_TRIGGER_MODE == "timer":
+        if self._trigger_mode == "timer":
             self.restart_timer()
             
         logger.info("All selected pieces switched successfully")
 
         return True
     
+    def _excluded_squares_mask(self):
+        """
+        Bitboard of occupied squares that the static switch rules already exclude:
+        kings, pieces within two squares of their own king, edge-rank pawns, and switched or promoted pieces.
+        """
+        board = self.board
+        excluded = board.kings | (board.pawns & _PAWN_EXCLUDED_RANKS)
+        for color in chess.COLORS:
+            king_square = board.king(color)
+            if king_square is not None:
+                excluded |= board.occupied_co[color] & _KING_ZONE[king_square]
+        for square in self.switched_pieces:
+            excluded |= chess.BB_SQUARES[square]
+        for square in self.promoted_pieces:
+            excluded |= chess.BB_SQUARES[square]
+        return excluded
+
     def _get_eligible_pieces(self):
-        """Returns a list of non-king pieces that can be switched."""
+        """Returns a list of (piece, square) pairs for the non-king pieces that can be switched."""
+        board = self.board
         eligible_pieces = []
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if self._is_valid_switch_piece(piece, square):
-                eligible_pieces.append((piece, square))
+        # Rule out most squares with bitboard masks, then visit only the occupied squares left
+        candidates = board.occupied & ~self._excluded_squares_mask()
+        while candidates:
+            square = (candidates & -candidates).bit_length() - 1
+            candidates &= candidates - 1
+            if self._is_valid_switch_piece(square):
+                eligible_pieces.append((board.piece_at(square), square))
         return eligible_pieces
 
     def _evaluate_switch_candidates(self, pieces, num_pieces=2):
         logger.debug(f"evaluate_switch_candidates() called with num_pieces={num_pieces}")
 
-        white_candidates = []
-        black_candidates = []
+        if num_pieces == 2:
+            wanted_colors = (chess.WHITE, chess.BLACK)
+        else:  # Single piece mode
+            # Simplified prioritization logic to strictly enforce alternating colors
+            # If last switched piece was BLACK (or no previous switch), prioritize WHITE
+            # If last switched piece was WHITE, prioritize BLACK
+            prioritize_white = (self.last_switched_color == chess.BLACK or self.last_switched_color is None)
+            wanted_colors = (chess.WHITE,) if prioritize_white else (chess.BLACK,)
 
-        # Sort pieces by probability impact (lower impact is better)
-        # We're using a copy of the board to avoid modifying the actual game state
-        board_copy = self.board.copy()
-        
-        # Evaluate each piece's impact on a copy of the board
-        piece_impacts = []
-        for piece, square in pieces:
-            # Evaluate impact using board copy
-            impact = self._evaluate_probability_change_safe(board_copy, piece, square)
-            piece_impacts.append((piece, square, sum(impact)))
-        
-        # Sort by impact
-        sorted_pieces = sorted(piece_impacts, key=lambda x: x[2])
-        
-        # Convert back to original format
-        sorted_pieces = [(p[0], p[1]) for p in sorted_pieces]
+            logger.debug(f"Last switched color: {self.last_switched_color}")
+            logger.info(f"Strictly prioritizing {'white' if prioritize_white else 'black'} pieces for switching")
 
-        # Separate pieces into white and black lists
-        for piece, square in sorted_pieces:
-            if piece.color == chess.WHITE:
-                white_candidates.append(square)
-            else:
-                black_candidates.append(square)
+        # Only the colors that can be selected need their impact evaluated
+        pieces = [(piece, square) for piece, square in pieces if piece.color in wanted_colors]
 
-        logger.debug(f"Initial White Candidates: {white_candidates}")
-        logger.debug(f"Initial Black Candidates: {black_candidates}")
-        
-        # Filter out pieces that would cause check
-        filtered_white_candidates = []
-        filtered_black_candidates = []
-        
-        for square in white_candidates:
-            if not self._would_cause_check(self.board, square):
-                filtered_white_candidates.append(square)
-            else:
-                logger.debug(f"White piece at {square} filtered out to prevent check")
-        
-        for square in black_candidates:
-            if not self._would_cause_check(self.board, square):
-                filtered_black_candidates.append(square)
-            else:
-                logger.debug(f"Black piece at {square} filtered out to prevent check")
-        
-        white_candidates = filtered_white_candidates
-        black_candidates = filtered_black_candidates
+        # We're using a copy of the board to avoid modifying the actual game state.
+        # It has no move stack, so an engine analysing it sees the flipped pieces
+        board_copy = self.board.copy(stack=False)
+
+        # With engine switching enabled, analyse every candidate position in one parallel batch
+        if WIN_PROBABILITY_MODE == "engine" and USE_ENGINE_FOR_SWITCHING and self._use_enhanced:
+            self._prefetch_engine_probs(board_copy, [square for _, square in pieces])
         
-        logger.debug(f"Filtered White Candidates: {white_candidates}")
-        logger.debug(f"Filtered Black Candidates: {black_candidates}")
+        # Evaluate each piece's impact on a copy of the board (lower impact is better).
+        # The order index keeps ties in the original piece order.
+        white_impacts = []
+        black_impacts = []
+        for order, (piece, square) in enumerate(pieces):
+            impact = sum(self._probability_change(board_copy, piece, square))
+            (white_impacts if piece.color == chess.WHITE else black_impacts).append((impact, order, square))
+
+        white_candidate = self._best_candidate(white_impacts)
+        black_candidate = self._best_candidate(black_impacts)
+
+        logger.debug(f"Best White Candidate: {white_candidate}")
+        logger.debug(f"Best Black Candidate: {black_candidate}")
 
         # Ensure we select exactly `num_pieces` pieces
         selected_squares = []
 
         if num_pieces == 2:
-            if white_candidates and black_candidates:
-                selected_squares.append(white_candidates[0])
-                selected_squares.append(black_candidates[0])
+            if white_candidate is not None and black_candidate is not None:
+                selected_squares.append(white_candidate)
+                selected_squares.append(black_candidate)
             else:
                 logger.info("Cannot find both white and black pieces for two-piece switching")
-        else:  # Single piece mode
-            # Simplified prioritization logic to strictly enforce alternating colors
-            # If last switched piece was BLACK (or no previous switch), prioritize WHITE
-            # If last switched piece was WHITE, prioritize BLACK
-            prioritize_white = (self.last_switched_color == chess.BLACK or self.last_switched_color is None)
-            
-            logger.debug(f"Last switched color: {self.last_switched_color}")
-            logger.info(f"Strictly prioritizing {'white' if prioritize_white else 'black'} pieces for switching")
-            
+        else:
             # STRICT ALTERNATING COLOR LOGIC:
             # Only select a piece if it matches the prioritized color
-            if prioritize_white and white_candidates:
-                selected_squares.append(white_candidates[0])
-                logger.info(f"Selected white piece at {white_candidates[0]}")
-            elif not prioritize_white and black_candidates:
-                selected_squares.append(black_candidates[0])
-                logger.info(f"Selected black piece at {black_candidates[0]}")
+            if prioritize_white and white_candidate is not None:
+                selected_squares.append(white_candidate)
+                logger.info(f"Selected white piece at {white_candidate}")
+            elif not prioritize_white and black_candidate is not None:
+                selected_squares.append(black_candidate)
+                logger.info(f"Selected black piece at {black_candidate}")
             else:
                 logger.info(f"No eligible {'white' if prioritize_white else 'black'} pieces found. Skipping switch entirely.")
                 # Return empty list to signal that no switch should occur
@@ -403,13 +407,27 @@ class SwitchManager:
         logger.info(f"Final candidates selected: {selected_squares} (Mode: {num_pieces})")
         return selected_squares
 
-    def _is_valid_switch_piece(self, piece, square):
-        """Checks if a piece is eligible for switching."""
-        if not piece or piece.piece_type == chess.KING:
+    def _best_candidate(self, impacts):
+        """
+        Return the square of the lowest-impact (impact, order, square) entry whose
+        switch would not cause check, or None. Only pops as far as the first valid one.
+        """
+        heapq.heapify(impacts)
+        while impacts:
+            _, _, square = heapq.heappop(impacts)
+            if not self._would_cause_check(self.board, square):
+                return square
+            logger.debug(f"Piece at {square} filtered out to prevent check")
+        return None
+
+    def _is_valid_switch_piece(self, square):
+        """Checks if the piece on a square is eligible for switching."""
+        piece_type = self.board.piece_type_at(square)
+        if piece_type is None or piece_type == chess.KING:
             return False
         if square in self.switched_pieces:
             return False
-        if self._is_piece_protected(piece, square):
+        if self._is_piece_protected(self.board.color_at(square), square):
             return False
             
         # Check if the piece is directly attacking the opponent's king
@@ -418,13 +436,10 @@ class SwitchManager:
             return False
         
         # Check pawn position - prevent switching pawns at starting position or near promotion
-        if piece.piece_type == chess.PAWN:
-            rank = chess.square_rank(square)
-            # White pawns on rank 1 (starting) or rank 6 (one step from promotion)
-            # Black pawns on rank 6 (starting) or rank 1 (one step from promotion)
-            if (piece.color == chess.WHITE and (rank == 1 or rank == 6)) or \
-            (piece.color == chess.BLACK and (rank == 6 or rank == 1)):
-                return False
+        # White pawns on rank 1 (starting) or rank 6 (one step from promotion)
+        # Black pawns on rank 6 (starting) or rank 1 (one step from promotion)
+        if piece_type == chess.PAWN and chess.BB_SQUARES[square] & _PAWN_EXCLUDED_RANKS:
+            return False
         
         # Prevent switching promoted pieces
         if square in self.promoted_pieces:
@@ -432,90 +447,140 @@ class SwitchManager:
                 
         return True
     
-    def _is_piece_protected(self, piece, square):
+    def _is_piece_protected(self, color, square):
         """Checks if a piece is too close to the king or in a protected position."""
-        king_square = self.board.king(piece.color)
-        return chess.square_distance(square, king_square) <= 2
+        king_square = self.board.king(color)
+        return _KING_DIST[square * 64 + king_square] <= 2
 
     def _is_piece_attacking_king(self, piece_square):
         """
         Checks if a piece at the given square is directly attacking the opponent's king.
         """
-        piece = self.board.piece_at(piece_square)
-        if not piece:
+        color = self.board.color_at(piece_square)
+        if color is None:
             return False
             
-        opponent_color = not piece.color
-        opponent_king_square = self.board.king(opponent_color)
-        if not opponent_king_square:
+        opponent_king_square = self.board.king(not color)
+        if opponent_king_square is None:
             return False
             
-        # Save original turn
-        original_turn = self.board.turn
-        
-        # Set board to piece's turn so we can check its moves
-        self.board.turn = piece.color
-        
-        # Check if this piece can attack the opponent's king
-        is_attacking = False
-        for move in self.board.legal_moves:
-            if move.from_square == piece_square and move.to_square == opponent_king_square:
-                is_attacking = True
-                break
-        
-        # Restore original turn
-        self.board.turn = original_turn
-        
-        return is_attacking
+        # One lookup in python-chess's attack tables, without generating moves or touching the turn
+        return bool(self.board.attacks_mask(piece_square) & chess.BB_SQUARES[opponent_king_square])
 
     def _would_cause_check(self, board, square):
             """Simulates a piece color switch and checks if it would cause check."""
-            # Create a temporary board copy for simulation
-            temp_board = board.copy()
-            piece = temp_board.piece_at(square)
-            if not piece:
+            if board.piece_type_at(square) is None:
                 return False
                 
-            # Simulate the color switch
-            temp_board.remove_piece_at(square)
-            temp_board.set_piece_at(square, chess.Piece(piece.piece_type, not piece.color))
-            
-            # Check if the switch would put either king in check
-            white_king_square = temp_board.king(chess.WHITE)
-            black_king_square = temp_board.king(chess.BLACK)
-            
-            # Return True if either king would be in check
-            return (white_king_square and temp_board.is_check()) or \
-                (black_king_square and temp_board.turn == chess.BLACK and temp_board.is_check())
+            # Simulate the color switch in place
+            with self._with_flipped_color(board, square):
+                # Check if the switch would put either king in check
+                white_king_square = board.king(chess.WHITE)
+                black_king_square = board.king(chess.BLACK)
+                
+                # Return True if either king would be in check, whichever side is to move
+                return (white_king_square is not None and board.is_attacked_by(chess.BLACK, white_king_square)) or \
+                    (black_king_square is not None and board.is_attacked_by(chess.WHITE, black_king_square))
 
     def _evaluate_probability_change_safe(self, board, piece, square):
         """Evaluates the win probability change if a piece is switched without modifying the original board."""
-        # First, calculate probabilities with the original board state
-        original_white_prob, original_black_prob = calculate_win_probability(board)
-        
-        # Create a temporary board copy for the simulation
-        temp_board = board.copy()
-        temp_piece = temp_board.piece_at(square)
-        if temp_piece:
-            temp_board.remove_piece_at(square)
-            temp_board.set_piece_at(square, chess.Piece(temp_piece.piece_type, not temp_piece.color))
-            
-        # Calculate probabilities with the simulated change
-        new_white_prob, new_black_prob = calculate_win_probability(temp_board)
+        # The board's scores are summed once per position; a switch only moves
+        # this one piece's contribution from its side to the other
+        white_score, black_score = self._cached_probs("material", board, None, material_scores)
+        own_score = piece_score(piece.piece_type, piece.color, square)
+        switched_score = piece_score(piece.piece_type, not piece.color, square)
+        if piece.color == chess.WHITE:
+            new_white_score, new_black_score = white_score - own_score, black_score + switched_score
+        else:
+            new_white_score, new_black_score = white_score + switched_score, black_score - own_score
+
+        original_white_prob, original_black_prob = probability_from_scores(white_score, black_score)
+        new_white_prob, new_black_prob = probability_from_scores(new_white_score, new_black_score)
         
         # Return the absolute differences in probabilities
         return abs(new_white_prob - original_white_prob), abs(new_black_prob - original_black_prob)
 
+    @staticmethod
+    @contextmanager
+    def _with_flipped_color(board, square):
+        """
+        Temporarily flip the color of the piece on square, restoring it on exit.
+        Uses the BaseBoard setters so the board's move stack is left intact.
+        """
+        piece_type = board.piece_type_at(square)
+        if piece_type is None:
+            yield board
+            return
+
+        mask = chess.BB_SQUARES[square]
+        color = bool(board.occupied_co[chess.WHITE] & mask)
+        promoted = bool(board.promoted & mask)
+        board._set_piece_at(square, piece_type, not color, promoted)
+        try:
+            yield board
+        finally:
+            board._set_piece_at(square, piece_type, color, promoted)
+
+    def _cached_probs(self, evaluator, board, square, evaluate):
+        """
+        Return evaluate() for the board with the piece on square flipped, or for the
+        board as is when square is None, reusing results for positions seen before.
+        """
+        key = (evaluator, board._transposition_key(), square)
+        probs = self._prob_cache.get(key)
+        if probs is None:
+            if square is None:
+                probs = evaluate(board)
+            else:
+                with self._with_flipped_color(board, square):
+                    probs = evaluate(board)
+
+            self._store_probs(key, probs)
+        return probs
+
+    def _store_probs(self, key, probs):
+        """Add an entry to the win probability cache, resetting it when full."""
+        if len(self._prob_cache) >= PROB_CACHE_SIZE:
+            self._prob_cache.clear()
+        self._prob_cache[key] = probs
+
+    def _prefetch_engine_probs(self, board, squares):
+        """
+        Fill the enhanced-evaluation cache for the base position and each flipped
+        candidate square using one parallel engine batch instead of serial analyses.
+        """
+        position_key = board._transposition_key()
+        pending = [square for square in [None] + squares
+                   if ("enhanced", position_key, square) not in self._prob_cache]
+        if not pending:
+            return
+
+        # Each position gets its own board, since the engines analyse them concurrently
+        boards = []
+        for square in pending:
+            scratch = board.copy(stack=False)
+            if square is not None:
+                piece = scratch.piece_at(square)
+                if piece:
+                    scratch.set_piece_at(square, chess.Piece(piece.piece_type, not piece.color))
+            boards.append(scratch)
+
+        results = EngineManager.get_instance().analyse_many(boards, ENGINE_ANALYSIS_TIME)
+        for square, scratch, result in zip(pending, boards, results):
+            # Failed analyses are left for the per-candidate evaluation to retry
+            if result is not None:
+                self._store_probs(("enhanced", position_key, square), win_probability_from_analysis(scratch, result))
+
     def _perform_piece_switch(self, square, new_color, simulate=False):
         """Switches a piece's color. If `simulate=True`, uses a copy of the board."""
         if simulate:
-            # For simulation, use a temporary board copy
-            temp_board = self.board.copy()
+            # For simulation, use a temporary board copy. set_piece_at clears the
+            # move stack anyway, so there is no point copying it
+            temp_board = self.board.copy(stack=False)
             piece = temp_board.piece_at(square)
             if not piece:
                 return temp_board
                 
-            temp_board.remove_piece_at(square)
             temp_board.set_piece_at(square, chess.Piece(piece.piece_type, new_color))
             return temp_board
         else:
@@ -524,28 +589,12 @@ class SwitchManager:
             if not piece:
                 return
                 
-            self.board.remove_piece_at(square)
             self.board.set_piece_at(square, chess.Piece(piece.piece_type, new_color))
             
-            # Get move count from game if available
-            move_count = -1
-            if hasattr(self, 'game'):
-                move_count = self.game.move_count
-            elif hasattr(self, 'move_count'):
-                move_count = self.move_count
-                
-            self.switch_move_numbers.append(move_count)
+            self.switch_move_numbers.append(self.move_count)
             self.switched_pieces.add(square)
             self.last_switched_color = piece.color
 
-    def _highlight_piece_for_switch(self, square):
-        """Highlights a piece for switching and sets UI state."""
-        # We're now tracking multiple squares, so adding to the list
-        if square not in self.last_switched_squares:
-            self.last_switched_squares.append(square)
-            
-        self.switch_highlight_start_time = time.time()
-
     def sync_state_to_game(self, game):
         """Sync switch manager state to the game object."""
         game.last_switched_squares = self.last_switched_squares
@@ -553,37 +602,14 @@ class SwitchManager:
         game.is_switch_active = self.is_active
         game.switch_highlight_start_time = self.switch_highlight_start_time
         
-        # Sync the state as well
-        if hasattr(game, 'switch_manager'):
-            game.switch_manager.state = self.state
+        # Sync the state as well. ChessGame only assigns switch_manager after
+        # constructing this object, so it cannot be resolved in __init__
+        game.switch_manager.state = self.state
         
         # Sync promoted pieces (ensure we have the latest)
-        if hasattr(game, 'promoted_pieces'):
+        if self._game_has_promoted:
             self.promoted_pieces = game.promoted_pieces
         
         # If there's animation ongoing, make sure the game knows about it
         if self.animation_handler and self.animation_handler.active:
             game.caesar_move_active = True
-
-# Add these functions outside the class to maintain the monkey-patching interface
-def patch_switch_manager():
-    """
-    Keep this function for backward compatibility.
-    It no longer needs to do anything as patching is now built-in.
-    """
-    logger.info("Switch manager patching is now built into SwitchManager initialization")
-    return None
-
-def restore_switch_manager():
-    """
-    Restore the original _evaluate_probability_change_safe method.
-    This is now a wrapper around the instance method.
-    """
-    from switch_manager import SwitchManager
-    
-    # Find existing instances to restore
-    instances = [obj for obj in gc.get_objects() if isinstance(obj, SwitchManager)]
-    for instance in instances:
-        instance.restore_original_evaluation()
-    
-    logger.info("Restored original win probability evaluation for all switch manager instances")
@@ -1,10 +1,22 @@
 import chess.engine
+import queue
 import threading
 import time
-from configuration import UCI_ENGINE_PATH, logger
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from configuration import ANALYSIS_ENGINE_OPTIONS, ANALYSIS_POOL_SIZE, UCI_ENGINE_PATH, logger
+import win_probability
+
+# Number of analysis results EngineManager keeps for repeated positions
+RESULT_CACHE_SIZE = 256
+# UCI options for each pool engine: the pool supplies the parallelism, so each engine
+# searches on one thread with a small hash table (options an engine lacks are skipped)
+POOL_ENGINE_OPTIONS = {"Threads": 1, "Hash": 64}
 
 class UCIEngine:
     """Handles communication with a UCI chess engine (Stockfish, Lc0, etc.)."""
+
+    __slots__ = ('engine_path', 'engine')
     
     def __init__(self):
         """Initializes the UCI chess engine from configuration.py."""
@@ -33,6 +45,9 @@ class UCIEngine:
 
 class EngineManager:
     """Manages a UCI engine instance for analysis"""
+    __slots__ = ('engine', 'engine_path', '_pool_engines', '_idle_engines', '_executor',
+                 '_pool_lock', '_result_cache', '_inflight', '_cache_lock', '_analysis_lock',
+                 '_engine_failures', '_engine_disabled')
     _instance = None
     _lock = threading.Lock()
     
@@ -48,6 +63,19 @@ class EngineManager:
     def __init__(self):
         self.engine = None
         self.engine_path = UCI_ENGINE_PATH
+        # Worker engines for analyse_many, started on first use
+        self._pool_engines = None
+        self._idle_engines = queue.Queue()
+        self._executor = None
+        self._pool_lock = threading.Lock()
+        # Shared by every caller: finished results by position, and analyses still running
+        self._result_cache = OrderedDict()
+        self._inflight = {}
+        self._cache_lock = threading.Lock()
+        self._analysis_lock = threading.Lock()
+        # Consecutive failed analyses; after MAX_ENGINE_FAILURES the engine is off for the session
+        self._engine_failures = 0
+        self._engine_disabled = False
         self._initialize_engine()
     
     def _initialize_engine(self):
@@ -55,6 +83,7 @@ class EngineManager:
         try:
             self.engine = chess.engine.SimpleEngine.popen_uci(self.engine_path)
             logger.info(f"Analysis engine started: {self.engine_path}")
+            self._configure_engine()
         except FileNotFoundError:
             logger.error(f"Error: UCI engine not found at {self.engine_path}. Win probability will use material evaluation.")
             self.engine = None
@@ -62,19 +91,66 @@ class EngineManager:
             logger.error(f"Error initializing UCI engine: {str(e)}")
             self.engine = None
     
+    def _configure_engine(self):
+        """Apply ANALYSIS_ENGINE_OPTIONS, skipping any option the engine does not support"""
+        for name, value in ANALYSIS_ENGINE_OPTIONS.items():
+            if name not in self.engine.options:
+                logger.info(f"Analysis engine has no '{name}' option; leaving it at its default")
+                continue
+            try:
+                self.engine.configure({name: value})
+            except Exception as e:
+                logger.error(f"Error setting engine option {name}: {str(e)}")
+
     def get_engine(self):
         """Get the engine instance, reinitializing if needed"""
-        if self.engine is None:
+        if self.engine is None and not self._engine_disabled:
             self._initialize_engine()
         return self.engine
     
+    def analyse(self, board, limit, info=chess.engine.INFO_SCORE):
+        """Engine-compatible entry point so callers can pass the manager in place of an engine"""
+        return self.analyse_position(board, limit.time)
+
     def analyse_position(self, board, time_limit=None):
-        """Analyse a position using the UCI engine"""
+        """Analyse a position using the UCI engine.
+
+        Results are cached per position, and a request for a position that is
+        already being analysed waits for that analysis instead of starting another.
+        """
         if time_limit is None:
-            # Import ENGINE_ANALYSIS_TIME from win_probability instead of wp_config
-            from win_probability import ENGINE_ANALYSIS_TIME
-            time_limit = ENGINE_ANALYSIS_TIME
-            
+            # Read through the module so changes to the setting are picked up
+            time_limit = win_probability.ENGINE_ANALYSIS_TIME
+
+        key = (board._transposition_key(), time_limit)
+        with self._cache_lock:
+            result = self._cached_result(key)
+            if result is not None:
+                return result
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return future.result()
+
+        result = None
+        try:
+            with self._analysis_lock:
+                result = self._run_analysis(board, time_limit)
+        finally:
+            with self._cache_lock:
+                del self._inflight[key]
+                if result is not None:
+                    self._store_result(key, result)
+            future.set_result(result)
+        return result
+
+    def _run_analysis(self, board, time_limit):
+        """Analyse a position on the shared engine"""
         engine = self.get_engine()
         if engine is None:
             return None
@@ -85,13 +161,154 @@ class EngineManager:
                 chess.engine.Limit(time=time_limit),
                 info=chess.engine.INFO_SCORE
             )
-            return result
+        except win_probability.ENGINE_ERRORS as e:
+            logger.debug(f"Error during engine analysis: {str(e)}")
+            self._record_engine_failure()
+            return None
+        self._engine_failures = 0
+        return result
+
+    def _record_engine_failure(self):
+        """Count a failed analysis, disabling the engine for the session once failures repeat (caller holds _analysis_lock)"""
+        self._engine_failures += 1
+        if self._engine_failures < win_probability.MAX_ENGINE_FAILURES:
+            return
+        logger.error(f"Analysis engine failed {self._engine_failures} times in a row; "
+                     "win probability will use material evaluation for the rest of the session.")
+        self._engine_disabled = True
+        if self.engine is None:
+            return
+        try:
+            self.engine.quit()
+        except win_probability.ENGINE_ERRORS:
+            pass
+        self.engine = None
+
+    def _cached_result(self, key):
+        """Return the cached result for key, marking it recently used (caller holds _cache_lock)"""
+        result = self._result_cache.get(key)
+        if result is not None:
+            self._result_cache.move_to_end(key)
+        return result
+
+    def _store_result(self, key, result):
+        """Cache a result, evicting the least recently used one when full (caller holds _cache_lock)"""
+        self._result_cache[key] = result
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    def _start_pool(self):
+        """Start the worker engines used by analyse_many"""
+        engines = []
+        for _ in range(ANALYSIS_POOL_SIZE):
+            engine = self._open_pool_engine()
+            if engine is None:
+                break
+            engines.append(engine)
+            self._idle_engines.put(engine)
+
+        if engines:
+            self._executor = ThreadPoolExecutor(max_workers=len(engines))
+            logger.info(f"Analysis pool started with {len(engines)} engines")
+        self._pool_engines = engines
+
+    def _open_pool_engine(self):
+        """Start one pool engine with POOL_ENGINE_OPTIONS, or return None if it cannot be started"""
+        try:
+            engine = chess.engine.SimpleEngine.popen_uci(self.engine_path)
         except Exception as e:
-            logger.error(f"Error during engine analysis: {str(e)}")
+            logger.error(f"Error starting analysis pool engine: {str(e)}")
             return None
+        options = {name: value for name, value in POOL_ENGINE_OPTIONS.items() if name in engine.options}
+        try:
+            engine.configure(options)
+        except win_probability.ENGINE_ERRORS as e:
+            logger.debug(f"Error configuring analysis pool engine: {str(e)}")
+        return engine
+
+    def _replace_pool_engine(self, engine):
+        """Swap a terminated pool engine for a fresh one, returning None if none could be started"""
+        replacement = self._open_pool_engine()
+        engines = self._pool_engines
+        if engines is not None and engine in engines:
+            engines.remove(engine)
+            if replacement is not None:
+                engines.append(replacement)
+        return replacement
+
+    def _analyse_on_pool(self, board, limit):
+        """Analyse one position on an idle pool engine, which no other thread can use meanwhile"""
+        engine = self._idle_engines.get()
+        try:
+            if engine is None:
+                # This slot's engine died and could not be restarted
+                return None
+            try:
+                result = engine.analyse(board, limit, info=chess.engine.INFO_SCORE)
+            except win_probability.ENGINE_ERRORS as e:
+                logger.debug(f"Error during pooled engine analysis: {str(e)}")
+                if isinstance(e, chess.engine.EngineTerminatedError):
+                    # A dead engine would fail every later job, so requeue a fresh one instead
+                    engine = self._replace_pool_engine(engine)
+                # Pool failures count towards the same limit as the shared engine's
+                with self._analysis_lock:
+                    self._record_engine_failure()
+                return None
+            # Reset under the same lock as the increment so concurrent jobs can't mask a failure run
+            with self._analysis_lock:
+                self._engine_failures = 0
+            return result
+        finally:
+            # An empty slot (None) stays queued so waiting jobs never block on a lost engine
+            self._idle_engines.put(engine)
+
+    def analyse_many(self, boards, time_limit=None):
+        """Analyse several positions in parallel, returning one result (or None) per board"""
+        if time_limit is None:
+            # Read through the module so changes to the setting are picked up
+            time_limit = win_probability.ENGINE_ANALYSIS_TIME
+
+        with self._pool_lock:
+            if self._pool_engines is None:
+                self._start_pool()
+
+        if not self._pool_engines:
+            # No pool could be started, so fall back to the shared engine one position at a time
+            return [self.analyse_position(board, time_limit) for board in boards]
+
+        # Only positions that are not cached yet go to the pool
+        keys = [(board._transposition_key(), time_limit) for board in boards]
+        with self._cache_lock:
+            results = [self._cached_result(key) for key in keys]
+        # Once the engine is disabled, uncached positions are left to the material fallback
+        misses = [] if self._engine_disabled else [i for i, result in enumerate(results) if result is None]
+
+        limit = chess.engine.Limit(time=time_limit)
+        analysed = self._executor.map(lambda i: self._analyse_on_pool(boards[i], limit), misses)
+        for i, result in zip(misses, analysed):
+            results[i] = result
+
+        with self._cache_lock:
+            for i in misses:
+                if results[i] is not None:
+                    self._store_result(keys[i], results[i])
+        return results
     
     def close(self):
         """Close the engine"""
+        with self._pool_lock:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            for engine in self._pool_engines or ():
+                try:
+                    engine.quit()
+                except Exception as e:
+                    logger.error(f"Error closing pool engine: {str(e)}")
+            self._pool_engines = None
+            self._idle_engines = queue.Queue()
+
         if self.engine:
             try:
                 self.engine.quit()
@@ -10,22 +10,20 @@ The consolidated module maintains the same API and functionality
 while simplifying the codebase.
 """
 
+import asyncio
 import chess
+import chess.engine
+import logging
 import math
 import time
-import importlib
-import os
 import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from configuration import logger
 from evaluation import calculate_win_probability as original_probability
 from evaluation import calculate_win_probability as material_based_probability
 
-import time
-import matplotlib.pyplot as plt
-import numpy as np
-import chess.engine
-
 # Win Probability Configuration
 WIN_PROBABILITY_MODE = "engine"  # Options: "material", "enhanced", "engine"
 
@@ -33,11 +31,20 @@ WIN_PROBABILITY_MODE = "engine"  # Options: "material", "enhanced", "engine"
 USE_ENGINE_FOR_DISPLAY = True      # Use engine evaluation for display/plotting
 USE_ENGINE_FOR_SWITCHING = False   # Use engine for switch candidate evaluation
 ENGINE_ANALYSIS_TIME = 0.1         # Time in seconds for engine analysis
+MAX_ENGINE_FAILURES = 3            # Consecutive failed analyses before the engine is disabled
+
+# Failures an engine analysis is expected to raise (EngineTerminatedError is an EngineError);
+# anything else is a bug and is left to propagate
+ENGINE_ERRORS = (chess.engine.EngineError, asyncio.TimeoutError, TimeoutError)
 
 # Stability factor settings
 STABILITY_FACTOR_ENABLED = True    # Apply stability factor to win probability
 STABILITY_FACTOR_WEIGHT = 0.01     # Weight of the stability factor
 
+# Comparison settings
+WIN_PROBABILITY_COMPARE = False    # Also run and log all three methods on every call (diagnostics only)
+COMPARISON_VERBOSE = True          # Print each comparison to the console as well as the log
+
 # Cache settings
 CACHE_ENABLED = True               # Enable caching of evaluations
 CACHE_EXPIRY = 5                   # Cache expiry time in seconds
@@ -46,46 +53,43 @@ CACHE_EXPIRY = 5                   # Cache expiry time in seconds
 # Cache Management (from win_probability.py)
 # -----------------------------------------------------------------------------
 
-# Simple cache to avoid redundant calculations
-_eval_cache = {}
-_cache_expiry = 5  # seconds
+# Evaluations kept by calculate_win_probability_enhanced
+EVAL_CACHE_SIZE = 4096
 
-def get_cached_eval(board_fen, default=None):
-    """Get cached evaluation if available and not expired"""
-    if board_fen in _eval_cache:
-        timestamp, value = _eval_cache[board_fen]
-        if time.time() - timestamp < _cache_expiry:
-            return value
-    return default
-
-def set_cached_eval(board_fen, value):
-    """Cache an evaluation with current timestamp"""
-    _eval_cache[board_fen] = (time.time(), value)
+def _cache_epoch():
+    """Coarse time bucket that is part of the cache key, so entries expire every CACHE_EXPIRY seconds"""
+    return int(time.monotonic() / CACHE_EXPIRY)
 
 # -----------------------------------------------------------------------------
 # Core Calculation Functions (from win_probability.py)
 # -----------------------------------------------------------------------------
 
+# 10 ** (-cp / 400) == exp(-cp * ln(10) / 400)
+_LN10_OVER_400 = math.log(10) / 400
+
 def centipawn_to_probability(cp_score):
     """Convert centipawn score to win probability using sigmoid function"""
-    return 1 / (1 + 10 ** (-cp_score / 400))
+    return 1.0 / (1.0 + math.exp(-cp_score * _LN10_OVER_400))
 
 def count_vulnerable_pieces(board, color):
     """Count pieces that would be eligible for color switching"""
-    count = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.color == color and piece.piece_type != chess.KING:
-            # Basic check - exclude kings and consider all other pieces vulnerable
-            # In a real implementation, you would use the same criteria as switch_manager
-            count += 1
-    return count
+    # Basic check - exclude kings and consider all other pieces vulnerable
+    # In a real implementation, you would use the same criteria as switch_manager
+    return chess.popcount(board.occupied_co[color] & ~board.kings)
 
 def apply_stability_factor(board, white_prob, black_prob):
     """Apply a stability factor based on vulnerability to color switches"""
-    # Count pieces eligible for switching
-    white_vulnerable = count_vulnerable_pieces(board, chess.WHITE)
-    black_vulnerable = count_vulnerable_pieces(board, chess.BLACK)
+    # Count pieces eligible for switching (as count_vulnerable_pieces, sharing one king mask)
+    non_kings = ~board.kings
+    white_vulnerable = chess.popcount(board.occupied_co[chess.WHITE] & non_kings)
+    black_vulnerable = chess.popcount(board.occupied_co[chess.BLACK] & non_kings)
+    
+    # Equal penalties cancel out in the renormalization, so only renormalize
+    if white_vulnerable == black_vulnerable:
+        total = white_prob + black_prob
+        if total > 0:
+            return white_prob/total, black_prob/total
+        return 0.5, 0.5
     
     # Apply small penalty to probability based on vulnerability
     stability_factor = 0.01  # Small adjustment factor
@@ -100,51 +104,69 @@ def apply_stability_factor(board, white_prob, black_prob):
     else:
         return 0.5, 0.5
 
-def calculate_win_probability_enhanced(board, engine=None, use_engine=True, stability_aware=True):
-    """Enhanced win probability calculation that can use engine evaluation"""
-    # Check cache first
-    board_fen = board.fen()
-    cached = get_cached_eval(board_fen)
-    if cached:
-        return cached
-    
-    # Try to use engine if available
-    if engine and use_engine:
-        try:
-            result = engine.analyse(board, chess.engine.Limit(time=0.1), info=chess.engine.INFO_SCORE)
-            if 'score' in result:
-                score = result['score'].relative
-                if score.is_mate():
-                    # Handle mate scores
-                    if score.mate() > 0:
-                        white_prob, black_prob = 0.99, 0.01
-                    else:
-                        white_prob, black_prob = 0.01, 0.99
-                else:
-                    # Normal centipawn score
-                    cp_score = score.score()
-                    white_prob = centipawn_to_probability(cp_score)
-                    black_prob = 1 - white_prob
+def win_probability_from_analysis(board, result, stability_aware=True):
+    """Convert an engine analysis result into (white, black) win probabilities"""
+    if result and 'score' in result:
+        score = result['score'].relative
+        if score.is_mate():
+            # Handle mate scores
+            if score.mate() > 0:
+                white_prob, black_prob = 0.99, 0.01
             else:
-                # Fall back to material evaluation
-                white_prob, black_prob = original_probability(board)
-        except Exception as e:
-            # If engine analysis fails, use material evaluation
-            print(f"Engine analysis failed: {e}")
-            white_prob, black_prob = original_probability(board)
+                white_prob, black_prob = 0.01, 0.99
+        else:
+            # Normal centipawn score
+            cp_score = score.score()
+            white_prob = centipawn_to_probability(cp_score)
+            black_prob = 1 - white_prob
     else:
-        # Use existing material-based evaluation
+        # Fall back to material evaluation
         white_prob, black_prob = original_probability(board)
     
     # Apply stability factor if requested
     if stability_aware:
         white_prob, black_prob = apply_stability_factor(board, white_prob, black_prob)
     
-    # Cache the result
-    result = (white_prob, black_prob)
-    set_cached_eval(board_fen, result)
+    return white_prob, black_prob
+
+@lru_cache(maxsize=None)
+def _engine_limit(seconds):
+    """Search limit for enhanced engine evaluations, built once per ENGINE_ANALYSIS_TIME value"""
+    return chess.engine.Limit(time=seconds)
+
+def _evaluate_enhanced(board, engine, stability_aware):
+    """Uncached body of calculate_win_probability_enhanced; engine is None for material scoring"""
+    # Try to use engine if available, otherwise use existing material-based evaluation
+    analysis = None
+    if engine is not None:
+        try:
+            # Read the setting at call time so changes to it take effect. Passing the
+            # EngineManager as engine reuses its per-position result cache
+            analysis = engine.analyse(board, _engine_limit(ENGINE_ANALYSIS_TIME), info=chess.engine.INFO_SCORE)
+        except ENGINE_ERRORS as e:
+            # If engine analysis fails, use material evaluation
+            logger.debug(f"Engine analysis failed: {e}")
     
-    return result
+    return win_probability_from_analysis(board, analysis, stability_aware)
+
+@lru_cache(maxsize=EVAL_CACHE_SIZE)
+def _cached_enhanced(fen, engine, stability_aware, epoch):
+    """Memoised _evaluate_enhanced; the board is only rebuilt from its FEN on a miss"""
+    return _evaluate_enhanced(chess.Board(fen), engine, stability_aware)
+
+def calculate_win_probability_enhanced(board, engine=None, use_engine=True, stability_aware=True, fen=None):
+    """Enhanced win probability calculation that can use engine evaluation.
+
+    Callers that already have board.fen() can pass it as fen to save regenerating it.
+    """
+    # Reduce engine/use_engine to the engine that will actually score the position, so
+    # every material-scored call shares one cache entry and never collides with an engine-scored one
+    scoring_engine = engine if (engine and use_engine) else None
+    if fen is None:
+        fen = board.fen()
+    if not CACHE_ENABLED:
+        return _evaluate_enhanced(board, scoring_engine, stability_aware)
+    return _cached_enhanced(fen, scoring_engine, stability_aware, _cache_epoch())
 
 # Function that maintains the same interface as the original
 def calculate_win_probability_wrapper(board, use_enhanced=False, engine=None):
@@ -181,6 +203,8 @@ def calculate_win_probability(board):
     This function maintains the exact same interface as the original but can
     provide enhanced functionality based on configuration settings.
     """
+    if WIN_PROBABILITY_COMPARE:
+        return calculate_with_comparison(board)
     
     mode = WIN_PROBABILITY_MODE
     
@@ -192,8 +216,8 @@ def calculate_win_probability(board):
         # Get engine if needed
         engine = None
         if mode == "engine":
-            engine_manager = get_engine_manager()
-            engine = engine_manager.get_engine()
+            # The manager shares cached and in-flight analyses with the switch manager
+            engine = get_engine_manager()
         
         # Use the enhanced probability function
         return calculate_win_probability_enhanced(
@@ -219,11 +243,7 @@ def update_win_probability():
     print("Updating win probability calculation...")
     
     try:
-        # Import the switch manager and call its patch method directly
-        import switch_manager
-        switch_manager.patch_switch_manager()
-        print("✓ SwitchManager patched successfully")
-        
+        # SwitchManager selects its evaluation from WIN_PROBABILITY_MODE itself
         # Override the evaluation module in sys.modules
         sys.modules['evaluation'] = sys.modules[__name__]
         print("✓ Win probability function replaced")
@@ -235,19 +255,13 @@ def update_win_probability():
         print(f"Error updating win probability: {str(e)}")
         print("The game will continue to use the original win probability calculation.")
 
-# -----------------------------------------------------------------------------
-# Cleanup Function (from enhanced_win_probability.py)
-# -----------------------------------------------------------------------------
-
-def shutdown():
-    """Shutdown the engine when the application closes"""
-    global _engine_manager
-    if _engine_manager:
-        _engine_manager.close()
-        _engine_manager = None
-
 # Add after the existing classes and functions in win_probability.py
 
+# Per-move comparison values, in CSV column order after 'move'
+RESULT_COLUMNS = ('material_white', 'material_black', 'material_time',
+                  'enhanced_white', 'enhanced_black', 'enhanced_time',
+                  'engine_white', 'engine_black', 'engine_time')
+
 class WinProbabilityComparison:
     """Class to manage and compare different win probability calculations"""
     
@@ -255,10 +269,29 @@ class WinProbabilityComparison:
         from uci_engine import EngineManager
         self.engine_manager = EngineManager.get_instance()
         self.engine = self.engine_manager.get_engine()
-        self.results = []
+        # Results are stored column-wise as packed doubles (NaN where the engine gave
+        # nothing), so plotting and saving read whole columns instead of nested dicts
+        self._moves = array('i')
+        self._columns = {name: array('d') for name in RESULT_COLUMNS}
+        self._fens = []
+        # Runs the engine evaluation while the material and enhanced ones are computed
+        self._engine_executor = ThreadPoolExecutor(max_workers=1)
+        # Figure reused by every generate_comparison_plot call, created on first use
+        self._fig = None
+        self._ax = None
         
-    def calculate_all_probabilities(self, board):
+    def calculate_all_probabilities(self, board, fen=None):
         """Calculate win probability using all three methods and return comparison"""
+        if fen is None:
+            fen = board.fen()
+        
+        # 3. Engine-based calculation (if available), started first so the
+        # engine searches while the other two methods run
+        engine_future = None
+        # None once the manager's circuit breaker has disabled the engine
+        self.engine = self.engine_manager.get_engine()
+        if self.engine:
+            engine_future = self._engine_executor.submit(self._engine_probabilities, board, fen)
         
         # Start timing
         start_time = time.time()
@@ -273,188 +306,161 @@ class WinProbabilityComparison:
             board, 
             engine=None, 
             use_engine=False,
-            stability_aware=True
+            stability_aware=True,
+            fen=fen
         )
         enhanced_time = time.time() - start_time
         
-        # 3. Engine-based calculation (if available)
+        # Safely collect the engine evaluation
         engine_white, engine_black = None, None
-        # Safely try engine evaluation
         engine_time = 0
-        if self.engine:
-            try:
-                start_time = time.time()
-                engine_white, engine_black = calculate_win_probability_enhanced(
-                    board,
-                    engine=self.engine,
-                    use_engine=True,
-                    stability_aware=True
-                )
-                engine_time = time.time() - start_time
-            except Exception as e:
-                logger.error(f"Engine evaluation failed: {e}")
-                self.engine = None  # Disable engine after error
+        if engine_future is not None:
+            (engine_white, engine_black), engine_time = engine_future.result()
         
-        # Store results for later analysis
-        result = {
-            "move": len(self.results) + 1,
-            "fen": board.fen(),
-            "material": {
-                "white": material_white,
-                "black": material_black,
-                "time_ms": material_time * 1000
-            },
-            "enhanced": {
-                "white": enhanced_white,
-                "black": enhanced_black,
-                "time_ms": enhanced_time * 1000
-            },
-            "engine": {
-                "white": engine_white,
-                "black": engine_black,
-                "time_ms": engine_time * 1000 if engine_white else None
-            }
-        }
-        self.results.append(result)
+        # Store results for later analysis, in RESULT_COLUMNS order
+        if engine_white is None:
+            engine_row = (math.nan, math.nan, math.nan)
+        else:
+            engine_row = (engine_white, engine_black, engine_time * 1000)
+        row = (material_white, material_black, material_time * 1000,
+               enhanced_white, enhanced_black, enhanced_time * 1000) + engine_row
+        self._moves.append(len(self._moves) + 1)
+        self._fens.append(fen)
+        columns = self._columns
+        for name, value in zip(RESULT_COLUMNS, row):
+            columns[name].append(value)
         
         # Log the comparison
-        self._log_comparison(result)
+        self._log_comparison()
         
         # Return all probabilities in a dictionary
         return {
             "material": (material_white, material_black),
             "enhanced": (enhanced_white, enhanced_black),
-            "engine": (engine_white, engine_black) if engine_white else None
+            "engine": None if engine_white is None else (engine_white, engine_black)
         }
     
-    def _log_comparison(self, result):
-        """Log the comparison results"""
-        move = result["move"]
-        
-        material_w = result["material"]["white"] * 100
-        material_b = result["material"]["black"] * 100
-        material_time = result["material"]["time_ms"]
+    def _engine_probabilities(self, board, fen):
+        """Engine-based probabilities and the seconds they took, run on the engine executor"""
+        start_time = time.time()
+        # Go through the manager so repeated failures trip its circuit breaker
+        probabilities = calculate_win_probability_enhanced(
+            board,
+            engine=self.engine_manager,
+            use_engine=True,
+            stability_aware=True,
+            fen=fen
+        )
+        return probabilities, time.time() - start_time
+    
+    def _log_comparison(self):
+        """Log the comparison results of the latest move"""
+        # Skip all formatting when neither the console nor the log will show it
+        if not COMPARISON_VERBOSE and not logger.isEnabledFor(logging.INFO):
+            return
         
-        enhanced_w = result["enhanced"]["white"] * 100
-        enhanced_b = result["enhanced"]["black"] * 100
-        enhanced_time = result["enhanced"]["time_ms"]
+        row = {name: column[-1] for name, column in self._columns.items()}
         
         engine_str = "N/A"
-        if result["engine"]["white"]:
-            engine_w = result["engine"]["white"] * 100
-            engine_b = result["engine"]["black"] * 100
-            engine_time = result["engine"]["time_ms"]
-            engine_str = f"W:{engine_w:.1f}% B:{engine_b:.1f}% ({engine_time:.1f}ms)"
+        if not math.isnan(row["engine_white"]):
+            engine_str = "W:%.1f%% B:%.1f%% (%.1fms)" % (
+                row["engine_white"] * 100,
+                row["engine_black"] * 100,
+                row["engine_time"])
         
-        # Print comparison to console
-        print(f"\nMove {move} Win Probability Comparison:")
-        print(f"  Material: W:{material_w:.1f}% B:{material_b:.1f}% ({material_time:.1f}ms)")
-        print(f"  Enhanced: W:{enhanced_w:.1f}% B:{enhanced_b:.1f}% ({enhanced_time:.1f}ms)")
-        print(f"  Engine  : {engine_str}")
+        message = (
+            "Move %d Win Probability Comparison:\n"
+            "  Material: W:%.1f%% B:%.1f%% (%.1fms)\n"
+            "  Enhanced: W:%.1f%% B:%.1f%% (%.1fms)\n"
+            "  Engine  : %s"
+        ) % (
+            self._moves[-1],
+            row["material_white"] * 100, row["material_black"] * 100, row["material_time"],
+            row["enhanced_white"] * 100, row["enhanced_black"] * 100, row["enhanced_time"],
+            engine_str)
+        
+        # Print comparison to console in one write
+        if COMPARISON_VERBOSE:
+            print("\n" + message)
         
         # Also log to file
-        logger.info(f"Move {move} Win Probability Comparison:")
-        logger.info(f"  Material: W:{material_w:.1f}% B:{material_b:.1f}% ({material_time:.1f}ms)")
-        logger.info(f"  Enhanced: W:{enhanced_w:.1f}% B:{enhanced_b:.1f}% ({enhanced_time:.1f}ms)")
-        logger.info(f"  Engine  : {engine_str}")
+        logger.info(message)
     
     def save_results(self, filename="win_probability_comparison.csv"):
         """Save all results to a CSV file for further analysis"""
         import csv
         
         with open(filename, 'w', newline='') as csvfile:
-            fieldnames = ['move', 'material_white', 'material_black', 'material_time',
-                         'enhanced_white', 'enhanced_black', 'enhanced_time',
-                         'engine_white', 'engine_black', 'engine_time']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.writer(csvfile)
             
-            writer.writeheader()
-            for result in self.results:
-                writer.writerow({
-                    'move': result['move'],
-                    'material_white': result['material']['white'],
-                    'material_black': result['material']['black'],
-                    'material_time': result['material']['time_ms'],
-                    'enhanced_white': result['enhanced']['white'],
-                    'enhanced_black': result['enhanced']['black'],
-                    'enhanced_time': result['enhanced']['time_ms'],
-                    'engine_white': result['engine']['white'] if result['engine']['white'] else '',
-                    'engine_black': result['engine']['black'] if result['engine']['black'] else '',
-                    'engine_time': result['engine']['time_ms'] if result['engine']['time_ms'] else ''
-                })
+            writer.writerow(('move',) + RESULT_COLUMNS)
+            # Missing engine values (NaN) are written as empty cells
+            writer.writerows(
+                (move,) + tuple('' if math.isnan(value) else value for value in row)
+                for move, *row in zip(self._moves, *(self._columns[name] for name in RESULT_COLUMNS))
+            )
         
         print(f"\nWin probability comparison data saved to {filename}")
     
     def generate_comparison_plot(self, filename="win_probability_comparison.png"):
         """Generate a plot comparing the different win probability calculations"""
         try:
-            moves = [r['move'] for r in self.results]
+            # Plotting is the only user of matplotlib and numpy, so import them here
+            import matplotlib.pyplot as plt
+            import numpy as np
+            
+            count = len(self._moves)
+            moves = np.array(self._moves, dtype=int)
+            columns = {name: np.array(column, dtype=float) for name, column in self._columns.items()}
             
             # Material probabilities
-            material_white = [r['material']['white'] for r in self.results]
-            material_black = [r['material']['black'] for r in self.results]
+            material_white = columns['material_white']
+            material_black = columns['material_black']
             
             # Enhanced probabilities
-            enhanced_white = [r['enhanced']['white'] for r in self.results]
-            enhanced_black = [r['enhanced']['black'] for r in self.results]
+            enhanced_white = columns['enhanced_white']
+            enhanced_black = columns['enhanced_black']
             
-            # Engine probabilities (if available)
-            engine_white = []
-            engine_black = []
-            has_engine_data = False
+            # Engine probabilities (if available), NaN where a move has none
+            engine_white = columns['engine_white']
+            engine_black = columns['engine_black']
+            has_engine_data = not np.isnan(engine_white).all()
             
-            for r in self.results:
-                if r['engine']['white'] is not None:
-                    engine_white.append(r['engine']['white'])
-                    engine_black.append(r['engine']['black'])
-                    has_engine_data = True
-                else:
-                    # If we have some engine data but this move doesn't, use the last value
-                    if has_engine_data and engine_white:
-                        engine_white.append(engine_white[-1])
-                        engine_black.append(engine_black[-1])
-                    else:
-                        engine_white.append(None)
-                        engine_black.append(None)
-            
-            # Create plot
-            plt.figure(figsize=(12, 8))
+            # Create the figure once, then clear and redraw it on later calls
+            if self._fig is None:
+                self._fig, self._ax = plt.subplots(figsize=(12, 8))
+            else:
+                self._ax.clear()
+            ax = self._ax
             
             # Plot material probabilities
-            plt.plot(moves, material_white, 'b-', label='Material White', alpha=0.7)
-            plt.plot(moves, material_black, 'r-', label='Material Black', alpha=0.7)
+            ax.plot(moves, material_white, 'b-', label='Material White', alpha=0.7)
+            ax.plot(moves, material_black, 'r-', label='Material Black', alpha=0.7)
             
             # Plot enhanced probabilities
-            plt.plot(moves, enhanced_white, 'b--', label='Enhanced White', alpha=0.7)
-            plt.plot(moves, enhanced_black, 'r--', label='Enhanced Black', alpha=0.7)
+            ax.plot(moves, enhanced_white, 'b--', label='Enhanced White', alpha=0.7)
+            ax.plot(moves, enhanced_black, 'r--', label='Enhanced Black', alpha=0.7)
             
             # Plot engine probabilities if available
             if has_engine_data:
-                # Filter out None values
-                valid_moves = []
-                valid_engine_white = []
-                valid_engine_black = []
+                # Index of the latest move with engine data at or before each move, so a
+                # move without data reuses the last value; moves before the first are left out
+                last = np.maximum.accumulate(np.where(np.isnan(engine_white), -1, np.arange(count)))
+                valid = last >= 0
                 
-                for i, val in enumerate(engine_white):
-                    if val is not None:
-                        valid_moves.append(moves[i])
-                        valid_engine_white.append(engine_white[i])
-                        valid_engine_black.append(engine_black[i])
-                
-                plt.plot(valid_moves, valid_engine_white, 'b:', label='Engine White', linewidth=2)
-                plt.plot(valid_moves, valid_engine_black, 'r:', label='Engine Black', linewidth=2)
+                ax.plot(moves[valid], engine_white[last[valid]], 'b:', label='Engine White', linewidth=2)
+                ax.plot(moves[valid], engine_black[last[valid]], 'r:', label='Engine Black', linewidth=2)
             
-            plt.xlabel('Move Number')
-            plt.ylabel('Win Probability')
-            plt.title('Win Probability Comparison')
-            plt.ylim(0, 1)
-            plt.xlim(left=1)
-            plt.grid(True, alpha=0.3)
-            plt.legend()
+            ax.set_xlabel('Move Number')
+            ax.set_ylabel('Win Probability')
+            ax.set_title('Win Probability Comparison')
+            ax.set_ylim(0, 1)
+            ax.set_xlim(left=1)
+            ax.grid(True, alpha=0.3)
+            ax.legend()
             
             # Save plot
-            plt.savefig(filename)
-            plt.close()
+            self._fig.savefig(filename)
             
             print(f"\nWin probability comparison plot saved to {filename}")
             
@@ -473,10 +479,10 @@ def get_comparison_instance():
         _comparison_instance = WinProbabilityComparison()
     return _comparison_instance
 
-def calculate_win_probability(board):
+def calculate_with_comparison(board):
     """
-    Drop-in replacement for the original calculate_win_probability function
-    that also performs comparison of all methods.
+    Diagnostic variant of calculate_win_probability that runs and logs all
+    three methods. Used when WIN_PROBABILITY_COMPARE is set.
     
     Returns the probability from the currently configured method.
     """
@@ -484,7 +490,7 @@ def calculate_win_probability(board):
     comparison = get_comparison_instance()
     
     # Calculate and compare all methods
-    all_probabilities = comparison.calculate_all_probabilities(board)
+    all_probabilities = comparison.calculate_all_probabilities(board, board.fen())
     
     # Return the value from the configured method
     mode = WIN_PROBABILITY_MODE
@@ -503,11 +509,21 @@ def save_comparison_data():
     comparison.save_results()
     comparison.generate_comparison_plot()
 
+# -----------------------------------------------------------------------------
+# Cleanup Function (from enhanced_win_probability.py)
+# -----------------------------------------------------------------------------
+
 def shutdown():
     """Shutdown the engine when the application closes"""
-    global _comparison_instance
+    global _engine_manager, _comparison_instance
     if _comparison_instance:
-        _comparison_instance.engine_manager.close()
+        _comparison_instance._engine_executor.shutdown(wait=True)
+        # Both hold the same EngineManager singleton
+        _engine_manager = _engine_manager or _comparison_instance.engine_manager
+        _comparison_instance = None
+    if _engine_manager:
+        _engine_manager.close()
+        _engine_manager = None
 
 # For backward compatibility with the previous files
 def update_win_probability():